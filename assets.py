@@ -0,0 +1,213 @@
+import pygame
+import os
+import sys
+import json
+import mmap
+import struct
+import queue
+import threading
+
+# --- ASSET PACK ---
+# Every sprite the game loads, with the size it gets scaled to and whether it keeps alpha.
+# `python assets.py` bakes them all, pre-scaled, into one raw pixel file so startup skips PNG decoding.
+SCREEN_SIZE = (400, 600)  # main.WIDTH, main.HEIGHT
+ASSET_SPECS = {
+    # Backgrounds (BG_IMAGES)
+    "background.png": (SCREEN_SIZE, False),
+    "nightbackground.png": (SCREEN_SIZE, False),
+    "snowbackground.png": (SCREEN_SIZE, False),
+    # Items & characters
+    "moneybag.png": ((35, 35), True),
+    "character.png": ((25, 50), True),
+    "helicopter.png": ((60, 30), True),
+    "shield.png": ((30, 30), True),
+    # Platforms (PLAT_ASSETS)
+    "platform.png": ((100, 18), True),
+    "horizontalplatform.png": ((100, 18), True),
+    "verticalplatform.png": ((100, 18), True),
+    "snowplatform.png": ((100, 18), True),
+    "snowyhorizontal.png": ((100, 18), True),
+    "snowyvertical.png": ((100, 18), True),
+}
+
+# Short sound effects, stored in the pack as raw PCM in the mixer's output format so loading skips MP3/OGG
+# decoding. A pack baked for another mixer format (rate, sample size, channels) falls back to the files.
+SOUND_FILES = ["menuclick.ogg", "jump.mp3", "land.ogg", "death.ogg", "moneyearned.mp3", "penniesland.mp3"]
+
+PACK_NAME = "assets.pack"
+PACK_MAGIC = b"WSCPACK1"
+# Layout: magic, u32 manifest length, JSON manifest, then raw pixel / PCM blobs at manifest offsets
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+def source_stamp(path):
+    st = os.stat(path)
+    return [st.st_size, int(st.st_mtime)]
+
+def bake(src_dir=script_dir, out_path=None):
+    out_path = out_path or os.path.join(src_dir, PACK_NAME)
+    manifest, blobs, offset = {}, [], 0
+    for name, (size, alpha) in ASSET_SPECS.items():
+        path = os.path.join(src_dir, name)
+        if not os.path.exists(path): continue
+        img = pygame.transform.scale(pygame.image.load(path), size)
+        fmt = "RGBA" if alpha else "RGB"
+        data = pygame.image.tobytes(img, fmt)
+        manifest[name] = {"offset": offset, "length": len(data), "size": list(size), "format": fmt, "source": source_stamp(path)}
+        blobs.append(data)
+        offset += len(data)
+    mixer = mixer_format()
+    for name in SOUND_FILES if mixer else []:
+        path = os.path.join(src_dir, name)
+        if not os.path.exists(path): continue
+        data = pygame.mixer.Sound(path).get_raw()
+        manifest[name] = {"offset": offset, "length": len(data), "mixer": mixer, "source": source_stamp(path)}
+        blobs.append(data)
+        offset += len(data)
+    header = json.dumps(manifest).encode()
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PACK_MAGIC + struct.pack("<I", len(header)) + header)
+        for data in blobs: f.write(data)
+    os.replace(tmp_path, out_path)
+    return manifest
+
+class AssetPack:
+    # Read-only view of a baked pack; pixels come straight out of the mapped file
+    def __init__(self, path, src_dir=script_dir):
+        self.src_dir = src_dir
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(PACK_MAGIC)] != PACK_MAGIC: raise ValueError(f"{path} is not an asset pack")
+        (header_len,) = struct.unpack_from("<I", self.map, len(PACK_MAGIC))
+        start = len(PACK_MAGIC) + 4
+        self.manifest = json.loads(self.map[start:start + header_len])
+        self.data_start = start + header_len
+
+    def entry(self, name):
+        entry = self.manifest.get(name)
+        if entry is None: return None
+        # Source file changed since the bake: let the caller fall back to it
+        path = os.path.join(self.src_dir, name)
+        if os.path.exists(path) and source_stamp(path) != entry["source"]: return None
+        return entry
+
+    def get(self, name):
+        entry = self.entry(name)
+        if entry is None: return None
+        start = self.data_start + entry["offset"]
+        return pygame.image.frombuffer(memoryview(self.map)[start:start + entry["length"]], tuple(entry["size"]), entry["format"])
+
+    def get_sound(self, name):
+        entry = self.entry(name)
+        init = pygame.mixer.get_init()
+        if entry is None or not init or entry["mixer"] != list(init): return None
+        start = self.data_start + entry["offset"]
+        return pygame.mixer.Sound(buffer=self.map[start:start + entry["length"]])  # Slicing the map copies
+
+    def close(self):
+        self.map.close(); self.file.close()
+
+def load_pack(path=None):
+    try: return AssetPack(path or os.path.join(script_dir, PACK_NAME))
+    except: return None
+
+def load_image_raw(pack, name):
+    # Pack first, PNG as a fallback; raises like pygame.image.load if neither exists. Safe off the main thread.
+    img = pack.get(name) if pack else None
+    if img is None: img = pygame.transform.scale(pygame.image.load(os.path.join(script_dir, name)), ASSET_SPECS[name][0])
+    return img
+
+def load_sound(pack, name):
+    # Pre-decoded PCM from the pack first, the compressed file as a fallback. Safe off the main thread.
+    sound = pack.get_sound(name) if pack else None
+    return sound if sound is not None else pygame.mixer.Sound(os.path.join(script_dir, name))
+
+def mixer_format():
+    # [frequency, size, channels] of the open mixer, opening the default one if needed; None without audio
+    try:
+        if not pygame.mixer.get_init(): pygame.mixer.init()
+        return list(pygame.mixer.get_init())
+    except pygame.error: return None
+
+def convert_image(img, name):
+    # convert() copies the pixels out, so nothing keeps a view into the mapped file
+    return img.convert_alpha() if ASSET_SPECS[name][1] else img.convert()
+
+class AssetLoader:
+    # Decodes images and sounds on a worker thread. The frame thread adopts finished ones with poll(),
+    # or blocks on the few it needs with wait_for(); either way on_ready(name, obj) runs on the frame thread.
+    def __init__(self, pack, jobs, on_ready):
+        self.pack, self.jobs, self.on_ready = pack, list(jobs), on_ready
+        self.results = queue.Queue()
+        self.done = set()
+        self.thread = threading.Thread(target=self.run, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def load(self, name, kind):
+        try: return load_image_raw(self.pack, name) if kind == "image" else load_sound(self.pack, name)
+        except: return None
+
+    def run(self):
+        # No local keeps the last raw surface alive once it's queued; see close_pack()
+        for name, kind in self.jobs: self.results.put((name, kind, self.load(name, kind)))
+
+    def adopt(self, name, kind, obj):
+        if obj is not None and kind == "image": obj = convert_image(obj, name)
+        self.done.add(name)
+        self.on_ready(name, obj)
+
+    def close_pack(self):
+        # Raw pack surfaces are views into the map, so this waits until the adopt loop has dropped the last one
+        if self.finished and self.pack: self.pack.close(); self.pack = None
+
+    def poll(self):
+        while True:
+            try: self.adopt(*self.results.get_nowait())
+            except queue.Empty: break
+        self.close_pack()
+
+    def wait_for(self, names):
+        wanted = set(names) & {name for name, kind in self.jobs}
+        while not wanted <= self.done: self.adopt(*self.results.get())
+        self.close_pack()
+
+    @property
+    def progress(self): return len(self.done), len(self.jobs)
+
+    @property
+    def finished(self): return len(self.done) == len(self.jobs)
+
+class TextureAtlas:
+    # Packs named sprites into one surface (shelf packing, tallest first); regions are Rects into .surface
+    def __init__(self, sprites, width=256, padding=1):
+        width = max([width] + [spr.get_width() for spr in sprites.values()])
+        order = sorted(sprites.items(), key=lambda kv: -kv[1].get_height())
+        self.regions = {}
+        x = y = shelf_h = 0
+        for name, spr in order:
+            w, h = spr.get_size()
+            if x + w > width: x, y, shelf_h = 0, y + shelf_h + padding, 0
+            self.regions[name] = pygame.Rect(x, y, w, h)
+            x, shelf_h = x + w + padding, max(shelf_h, h)
+        self.surface = pygame.Surface((width, max(1, y + shelf_h)), pygame.SRCALPHA)
+        for name, spr in order: self.surface.blit(spr, self.regions[name])
+        if pygame.display.get_surface(): self.surface = self.surface.convert_alpha()
+
+    def update(self, sprites):
+        # Swap art in place; regions keep their Rects so bound entities stay valid
+        for name, spr in sprites.items():
+            region = self.regions[name]
+            if spr.get_size() != region.size: raise ValueError(f"{name} is {spr.get_size()}, atlas region is {region.size}")
+            self.surface.fill((0, 0, 0, 0), region)
+            self.surface.blit(spr, region)
+
+    def __getitem__(self, name): return self.regions[name]
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else None
+    baked = bake(out_path=out)
+    total = sum(e["length"] for e in baked.values())
+    for name, e in baked.items():
+        print(f"{name:28s} " + (f"{e['size'][0]}x{e['size'][1]} {e['format']}" if "size" in e else f"PCM {e['mixer'][0]}Hz x{e['mixer'][2]}"))
+    print(f"Baked {len(baked)} assets ({total / 1024:.0f} KB) into {out or os.path.join(script_dir, PACK_NAME)}")
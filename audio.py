@@ -0,0 +1,51 @@
+import pygame
+
+# --- SOUND MANAGER ---
+# Each category of effect owns a fixed block of mixer channels, so a burst of one kind (a penny volley)
+# can never hold the channel a jump or a landing needs. When all of a category's channels are busy the
+# oldest voice in it is cut off for the new one, or, for categories that don't steal, the new sound is
+# dropped. Channels are reserved, so nothing else can pick them, and keep their volume between plays:
+# it is only pushed to them when the setting changes.
+class SoundManager:
+    def __init__(self, categories, volume):
+        # categories: {name: (channels, steal)}
+        self.volume = volume
+        self.sounds = {}  # sound name -> (Sound, category)
+        self.voices = {}  # category -> [[Channel, play order]]
+        self.steal = {name: steal for name, (count, steal) in categories.items()}
+        self.plays = 0
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled: return
+        total = sum(count for count, steal in categories.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for name, (count, steal) in categories.items():
+            self.voices[name] = [[pygame.mixer.Channel(first + i), 0] for i in range(count)]
+            first += count
+        self.apply_volume()
+
+    def add(self, name, sound, category):
+        if sound is not None: self.sounds[name] = (sound, category)
+
+    def set_volume(self, volume):
+        if volume == self.volume: return
+        self.volume = volume
+        self.apply_volume()
+
+    def apply_volume(self):
+        for voices in self.voices.values():
+            for voice in voices: voice[0].set_volume(self.volume)
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if entry is None or not self.enabled: return
+        sound, category = entry
+        voices = self.voices[category]
+        voice = next((v for v in voices if not v[0].get_busy()), None)
+        if voice is None:
+            if not self.steal[category]: return
+            voice = min(voices, key=lambda v: v[1])
+        self.plays += 1
+        voice[1] = self.plays
+        voice[0].play(sound)
@@ -0,0 +1,168 @@
+import os
+import sys
+import csv
+import time
+import argparse
+from collections import Counter
+from multiprocessing import Pool
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from sim import GameSim, Inputs, DIFFICULTIES, TICK_HZ, WIDTH
+from profiler import percentile
+
+# --- AUTOPILOT ---
+# A scripted player that reads the same GameSim state the renderer draws: hop to the nearest platform
+# above, steer for its centre, and sidestep penny volleys and helicopters. It's deterministic, so a
+# bot run is reproduced by (seed, difficulty) alone.
+class Autopilot:
+    STRAFE = 8  # px per tick, same as the player's sideways speed
+    JUMP_RISE = 210  # A jump climbs ~200px, and the screen scrolls helicopters down to meet us by as much
+
+    def __init__(self):
+        self.target = None
+        self.coin_columns = []  # x of every penny still above the player's feet, refreshed each tick
+
+    def next_platform(self, sim):
+        # Lowest platform that is still above the player's feet
+        feet = sim.player.rect.bottom
+        above = [p for p in sim.platforms if p.rect.top < feet - 10]
+        return max(above, key=lambda p: p.rect.top, default=None)
+
+    def landing_platform(self, sim):
+        # Closest platform still below the player's feet, for when the jump came up short
+        r = sim.player.rect
+        below = [p for p in sim.platforms if p.rect.top >= r.bottom - 20]
+        return min(below, key=lambda p: abs(p.rect.centerx - r.centerx) + (p.rect.top - r.bottom), default=None)
+
+    def threatened(self, sim, x):
+        player = sim.player
+        if player.invincible: return False
+        for px in self.coin_columns:
+            if abs(px - x) < 22: return True
+        for warn in sim.penny_warnings:
+            if warn.x - 20 < x < warn.x + warn.w + 20: return True
+        return False
+
+    def heli_crosses(self, sim, x, top, bottom, ticks):
+        # Will a helicopter flying through the band [top, bottom] sweep over column x within `ticks` ticks?
+        player = sim.player
+        if player.invincible or player.has_shield: return False
+        for h in sim.helis:
+            if h.rect.bottom < top or h.rect.top > bottom: continue
+            hx, direction = h.rect.x, h.direction
+            for _ in range(ticks):
+                if hx - 20 < x < hx + h.rect.width + 20: return True
+                hx += direction * h.speed
+                if hx + h.rect.width >= WIDTH: direction = -1
+                elif hx <= 0: direction = 1
+        return False
+
+    def dodge(self, sim, goal, platform):
+        # Safe column on `platform` nearest the goal; None if the whole platform is under fire
+        lo, hi = platform.rect.left + 8, platform.rect.right - 8
+        for offset in range(0, hi - lo + 1, self.STRAFE // 2):
+            for x in (goal - offset, goal + offset):
+                if lo <= x <= hi and not self.threatened(sim, x): return x
+        return None
+
+    def __call__(self, sim):
+        player = sim.player
+        r = player.rect
+        pennies, n = sim.pennies, sim.pennies.count
+        self.coin_columns = pennies.x[:n][pennies.y[:n] < r.bottom].tolist() if n else []
+        if player.on_ground:
+            self.target = self.next_platform(sim)
+        elif self.target is None or (player.vel_y > 0 and r.bottom > self.target.rect.top + 20):
+            self.target = self.landing_platform(sim)
+        if self.target is None: return Inputs()
+
+        # Land where it's safe on the platform we're heading for; a column off every platform is a fall
+        goal = self.target.rect.centerx
+        if self.threatened(sim, goal):
+            safe = self.dodge(sim, goal, self.target)
+            if safe is not None: goal = safe
+        if not player.on_ground:
+            return Inputs(left=goal < r.centerx - 4, right=goal > r.centerx + 4)
+
+        # Only take off when the climb won't cross a helicopter's path; they don't come down until we climb
+        jump = True
+        path = range(min(r.centerx, goal), max(r.centerx, goal) + 1, 16)
+        if self.threatened(sim, goal) or any(self.heli_crosses(sim, x, r.top - self.JUMP_RISE, r.top + 10, 35) for x in (*path, goal)):
+            jump, goal = False, r.centerx
+            ground = player.current_platform.rect
+            if self.heli_crosses(sim, r.centerx, r.top, r.bottom, 20):
+                # One is sweeping through at body height too: back away from it, or jump for it if we're cornered
+                away = min(sim.helis, key=lambda h: abs(h.rect.centery - r.centery)).rect.centerx < r.centerx
+                goal = ground.right - 8 if away else ground.left + 8
+                jump = self.heli_crosses(sim, goal, r.top, r.bottom, 20)
+            elif self.threatened(sim, r.centerx):
+                # Pennies coming down on us while we wait: shuffle along the platform, or leave it
+                safe = self.dodge(sim, r.centerx, player.current_platform)
+                if safe is None: jump, goal = True, self.target.rect.centerx
+                else: goal = safe
+        return Inputs(left=goal < r.centerx - 4, right=goal > r.centerx + 4, jump=jump)
+
+# --- MONTE CARLO HARNESS ---
+# python balance.py [--runs 1000] [--difficulty Medium] [--workers N] [--csv runs.csv]
+# Plays N bot games per difficulty across a process pool and prints the survival-height distribution,
+# death causes and earnings. Runs are independent and seeded, so results are identical for any --workers.
+MAX_TICKS = TICK_HZ * 60 * 15  # A bot still alive after 15 minutes of game time is recorded as "timeout"
+
+def play_one(job):
+    difficulty, seed, max_ticks = job
+    sim, bot = GameSim(difficulty, seed), Autopilot()
+    while not sim.game_over and sim.frame < max_ticks:
+        sim.step(bot(sim))
+    return {"difficulty": difficulty, "seed": seed, "height_ft": sim.player.height_ft, "run_cents": sim.player.run_cents,
+            "death": sim.death_cause or "timeout", "ticks": sim.frame}
+
+def run_all(difficulties, runs, base_seed=0, max_ticks=MAX_TICKS, workers=None):
+    jobs = [(d, base_seed + i, max_ticks) for d in difficulties for i in range(runs)]
+    with Pool(workers) as pool:
+        # Small chunks keep every worker busy to the end, since run lengths vary by orders of magnitude
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 16))
+        return list(pool.imap_unordered(play_one, jobs, chunksize=chunksize))
+
+def report(results, difficulties):
+    lines = []
+    for difficulty in difficulties:
+        rows = [r for r in results if r["difficulty"] == difficulty]
+        if not rows: continue
+        heights = sorted(r["height_ft"] for r in rows)
+        cents = sorted(r["run_cents"] for r in rows)
+        deaths = Counter(r["death"] for r in rows)
+        lines.append(f"== {difficulty}: {len(rows)} runs, {sum(r['ticks'] for r in rows) / len(rows) / TICK_HZ:.1f}s average run")
+        lines.append("  height ft  " + "  ".join(f"p{p}={percentile(heights, p)}" for p in (10, 25, 50, 75, 90, 99))
+                     + f"  mean={sum(heights) / len(heights):.0f}  max={heights[-1]}")
+        lines.append("  earned $   " + "  ".join(f"p{p}={percentile(cents, p) / 100:.2f}" for p in (10, 50, 90))
+                     + f"  mean={sum(cents) / len(cents) / 100:.2f}")
+        lines.append("  deaths     " + "  ".join(f"{cause}={count / len(rows):.1%}" for cause, count in deaths.most_common()))
+        # Survival curve: share of runs that got past each 250ft bonus line
+        for bucket in range(250, min(heights[-1], 5000) + 1, 250):
+            alive = sum(h >= bucket for h in heights) / len(heights)
+            lines.append(f"  {bucket:>5}ft {alive:6.1%} {'#' * round(alive * 40)}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo difficulty balancing with the autopilot")
+    parser.add_argument("--runs", type=int, default=1000, help="games per difficulty")
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES, help="only these (repeatable)")
+    parser.add_argument("--workers", type=int, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run; run i uses seed + i")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--csv", help="also write one row per run here")
+    args = parser.parse_args()
+
+    difficulties = args.difficulty or DIFFICULTIES
+    start = time.perf_counter()
+    results = run_all(difficulties, args.runs, args.seed, args.max_ticks, args.workers)
+    secs = time.perf_counter() - start
+    results.sort(key=lambda r: (DIFFICULTIES.index(r["difficulty"]), r["seed"]))
+    print(report(results, difficulties))
+    ticks = sum(r["ticks"] for r in results)
+    print(f"{len(results)} runs, {ticks} ticks in {secs:.1f}s ({ticks / max(secs, 1e-9):.0f} ticks/s)", file=sys.stderr)
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader(); writer.writerows(results)
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+# --- RENDERING BENCHMARKS ---
+# python bench.py [--frames 600] [--out run.json] [--baseline old.json] [--tolerance 1.25]
+# Drives scripted scenarios through the real sim and draw code on a dummy display and reports
+# per-section frame times (p50/p95/p99, ms) as JSON, plus each render cache's hits and misses over the
+# measured frames. With --baseline, exits 1 if any section's p95 got slower than baseline * tolerance.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main
+from sim import GameSim, Inputs, get_drop_width
+from profiler import FrameProfiler
+
+MIN_REGRESSION_MS = 0.05  # Ignore p95 changes smaller than this; they're timer noise
+CACHES = {"text_cache": main.text_cache, "sprite_variants": main.sprite_variants}
+
+def bot_inputs(frame):
+    # Hop constantly and sweep left/right so platforms, scrolling and landings all get exercised
+    return Inputs(left=(frame // 45) % 2 == 1, right=(frame // 45) % 2 == 0, jump=True)
+
+def gameplay_frame(state, prof):
+    sim, env = state["sim"], state["env"]
+    sim.prof = prof
+    sim.step(bot_inputs(sim.frame))
+    env.advance(sim.scroll_vel)
+    prof.lap("env.advance")
+    if state.get("setup"): state["setup"](sim)
+    prof.lap("scenario")
+    main.draw_game(main.screen, sim, env, 1.0, prof)
+    pygame.display.flip()
+    prof.lap("display.flip")
+    if sim.game_over: state["sim"] = new_sim(state)
+
+def new_sim(state):
+    sim = GameSim(state["difficulty"], seed=state["seed"])
+    if state.get("start"): state["start"](sim)
+    return sim
+
+def snow_start(sim):
+    sim.player.height_ft = 6000  # Blizzard at full density
+
+def heli_volley_start(sim):
+    player = sim.player
+    player.pixels_climbed, player.height_ft, player.last_bonus_bucket = 10000, 1000, 4
+
+def heli_volley_setup(sim):
+    # Keep two helicopters and a full penny volley on screen, and keep the player alive through them
+    player = sim.player
+    player.invincible, player.invincible_timer = True, sim.time_ms
+    while len(sim.helis) < 2:
+        sim.helis.spawn(player.height_ft, sim.difficulty, sim.rng).rect.y = sim.rng.randint(100, 400)
+    if not sim.penny_warnings:
+        w = get_drop_width(sim.difficulty, player.height_ft)
+        sim.penny_warnings.spawn(sim.rng.randint(0, main.WIDTH - w), w, sim.time_ms, 1500)
+    while len(sim.pennies) < 25:
+        sim.pennies.spawn(sim.rng.randint(10, main.WIDTH - 10), sim.rng.randint(-140, 500), sim.rng.uniform(8.0, 12.0))
+
+def idle_frame(state, prof):
+    # UI composition cost (paid whenever the screen's inputs change) and the steady-state idle present
+    layer = state["layer"]
+    layer.fill((0, 0, 0, 0))
+    state["draw_ui"](layer)
+    prof.lap("ui")
+    main.idle.present(main.screen, state["env"], state["name"], state["draw_ui"])
+    prof.lap("present")
+
+def gameplay(name, theme, difficulty, start=None, setup=None):
+    state = {"name": name, "difficulty": difficulty, "seed": 1234, "start": start, "setup": setup}
+    state["env"] = main.Environment(theme)
+    state["sim"] = new_sim(state)
+    return state, gameplay_frame
+
+def idle(name, draw_ui):
+    state = {"name": name, "env": main.Environment(0), "draw_ui": draw_ui,
+             "layer": pygame.Surface((main.WIDTH, main.HEIGHT), pygame.SRCALPHA)}
+    return state, idle_frame
+
+SCENARIOS = {
+    "snow_full_particles": lambda: gameplay("snow_full_particles", 2, "Medium", start=snow_start),
+    "helis_pennies_1000ft": lambda: gameplay("helis_pennies_1000ft", 0, "Difficult", start=heli_volley_start, setup=heli_volley_setup),
+    "tailor": lambda: idle("tailor", main.draw_tailor_ui),
+    "main_menu": lambda: idle("main_menu", main.draw_menu_ui),
+}
+
+def cache_counts():
+    return {name: (cache.hits, cache.misses) for name, cache in CACHES.items()}
+
+def run_scenario(name, frames, warmup=30):
+    # Returns (section summary, cache stats over the measured frames)
+    state, frame_fn = SCENARIOS[name]()
+    warm = FrameProfiler(window=warmup)
+    for _ in range(warmup):
+        warm.begin_frame(); frame_fn(state, warm); warm.end_frame()
+    before = cache_counts()
+    prof = FrameProfiler(window=frames)
+    for _ in range(frames):
+        prof.begin_frame(); frame_fn(state, prof); prof.end_frame()
+    caches = {}
+    for cache, (hits, misses) in cache_counts().items():
+        hits, misses = hits - before[cache][0], misses - before[cache][1]
+        caches[cache] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                         "size": CACHES[cache].stats()["size"]}
+    return prof.summary(), caches
+
+def compare(result, baseline, tolerance):
+    # Returns human-readable regressions: sections whose p95 grew past tolerance
+    regressions = []
+    for scenario, sections in result["scenarios"].items():
+        for section, stats in sections.items():
+            base = baseline.get("scenarios", {}).get(scenario, {}).get(section)
+            if not base: continue
+            if stats["p95"] > base["p95"] * tolerance and stats["p95"] - base["p95"] > MIN_REGRESSION_MS:
+                regressions.append(f"{scenario}/{section}: p95 {base['p95']:.3f} -> {stats['p95']:.3f} ms")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless rendering benchmarks")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="JSON from an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    main.asset_loader.wait_for([name for name, kind in main.asset_loader.jobs])
+    runs = {name: run_scenario(name, args.frames) for name in (args.scenario or SCENARIOS)}
+    result = {
+        "meta": {"frames": args.frames, "python": platform.python_version(), "pygame": pygame.version.ver,
+                 "video_driver": os.environ["SDL_VIDEODRIVER"], "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "scenarios": {name: sections for name, (sections, caches) in runs.items()},
+        "caches": {name: caches for name, (sections, caches) in runs.items()},
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f: f.write(text + "\n")
+    else: print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f: regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions: print("REGRESSION", line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
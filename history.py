@@ -0,0 +1,122 @@
+import math
+import time
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from sim import TICK_HZ
+
+# --- RUN HISTORY ---
+# Every finished run goes into a local SQLite database. record() only queues a row: a writer thread owns
+# the write connection and commits whatever has queued up as one transaction, so the game-over screen
+# never waits on disk. Queries use their own connection on the caller's thread; WAL mode lets them read
+# while a batch is being written. Top-N walks the (difficulty, height_ft) or (height_ft) index; counts and
+# percentiles read height_counts, a per-height tally kept by trigger, so they cost one row per distinct
+# height rather than one per run.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    height_ft INTEGER NOT NULL,
+    run_cents INTEGER NOT NULL,
+    duration_s REAL NOT NULL,
+    death TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_difficulty_height ON runs (difficulty, height_ft);
+CREATE INDEX IF NOT EXISTS runs_height ON runs (height_ft);
+CREATE TABLE IF NOT EXISTS height_counts (
+    difficulty TEXT NOT NULL,
+    height_ft INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (difficulty, height_ft)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS runs_tally AFTER INSERT ON runs BEGIN
+    INSERT INTO height_counts VALUES (NEW.difficulty, NEW.height_ft, 1)
+        ON CONFLICT (difficulty, height_ft) DO UPDATE SET n = n + 1;
+END;
+"""
+COLUMNS = "finished_at, difficulty, theme, seed, height_ft, run_cents, duration_s, death"
+Run = namedtuple("Run", COLUMNS)
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=5.0)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")  # With WAL: a power cut can drop the last batch, never corrupt the file
+    return db
+
+def where(difficulty):
+    # None means every difficulty
+    return ("", ()) if difficulty is None else (" WHERE difficulty = ?", (difficulty,))
+
+class RunHistory:
+    def __init__(self, path):
+        self.path = path
+        db = connect(path)
+        db.executescript(SCHEMA)
+        db.close()
+        self.reader = None  # Query connection, opened on first use by the thread that queries
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="history-writer", daemon=True)
+        self.thread.start()
+
+    def record(self, sim, theme):
+        self.pending.put((time.time(), sim.difficulty, theme, sim.seed, sim.player.height_ft, sim.player.run_cents,
+                          sim.frame / TICK_HZ, sim.death_cause or "quit"))
+
+    def run(self):
+        db = connect(self.path)
+        while True:
+            rows = [self.pending.get()]
+            # Everything that queued up meanwhile goes into the same transaction
+            while True:
+                try: rows.append(self.pending.get_nowait())
+                except queue.Empty: break
+            stop = None in rows
+            rows = [row for row in rows if row is not None]
+            try:
+                with db: db.executemany(f"INSERT INTO runs ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as exc: print(f"Could not record {len(rows)} run(s): {exc}")
+            if stop: break
+        db.close()
+
+    def query(self, sql, args=()):
+        if self.reader is None: self.reader = connect(self.path)
+        return self.reader.execute(sql, args).fetchall()
+
+    def top(self, n=10, difficulty=None):
+        # Highest runs first; ties go to the earlier run
+        clause, args = where(difficulty)
+        rows = self.query(f"SELECT {COLUMNS} FROM runs{clause} ORDER BY height_ft DESC, id LIMIT ?", args + (n,))
+        return [Run(*row) for row in rows]
+
+    def count(self, difficulty=None):
+        clause, args = where(difficulty)
+        return self.query(f"SELECT COALESCE(SUM(n), 0) FROM height_counts{clause}", args)[0][0]
+
+    def percentile(self, p, difficulty=None):
+        # Nearest-rank height percentile, matching profiler.percentile over every recorded height
+        n = self.count(difficulty)
+        if not n: return 0
+        rank = max(0, min(n - 1, math.ceil(p / 100 * n) - 1))
+        clause, args = where(difficulty)
+        seen = 0
+        for height_ft, count in self.query(f"SELECT height_ft, SUM(n) FROM height_counts{clause} GROUP BY height_ft ORDER BY height_ft", args):
+            seen += count
+            if seen > rank: return height_ft
+
+    def share_below(self, height_ft, difficulty=None):
+        # Fraction of recorded runs that ended lower than height_ft
+        n = self.count(difficulty)
+        if not n: return 0.0
+        clause, args = where(difficulty)
+        clause += " AND height_ft < ?" if clause else " WHERE height_ft < ?"
+        return self.query(f"SELECT COALESCE(SUM(n), 0) FROM height_counts{clause}", args + (height_ft,))[0][0] / n
+
+    def close(self, timeout=5.0):
+        # Called once at exit: commits anything still queued, then stops the writer
+        self.pending.put(None)
+        self.thread.join(timeout)
+        if self.reader is not None: self.reader.close()
@@ -1,6 +1,17 @@
 import pygame
 import random
 import os
+import sys
+import time
+import numpy as np
+from collections import OrderedDict
+import assets
+from sim import GameSim, Inputs, FixedStep
+from replay import InputLog
+from profiler import FrameProfiler
+from save import SaveStore, DEFAULTS
+from history import RunHistory
+from audio import SoundManager
 
 # --- INITIALIZATION ---
 pygame.init()
@@ -9,23 +20,52 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Wall Street Climber")
 clock = pygame.time.Clock()
 
-# Fonts
-font = pygame.font.SysFont("Arial", 26, bold=True)
-title_font = pygame.font.SysFont("Arial", 42, bold=True)
-small_font = pygame.font.SysFont("Arial", 18, bold=True)
-
 # File Paths
 script_dir = os.path.dirname(os.path.abspath(__file__))
 bg_names = ["background.png", "nightbackground.png", "snowbackground.png"]
 theme_labels = ["Day", "Night", "Snow"]
 
+# Fonts
+class FontRegistry:
+    # Every (family, size, bold) font is built once here; draw code only looks them up
+    def __init__(self, font_dir):
+        self.font_dir = font_dir
+        self.fonts = {}
+        self.frozen = False
+
+    def load(self, family, size, bold=False):
+        key = (family, size, bold)
+        if key in self.fonts: return self.fonts[key]
+        if self.frozen: raise RuntimeError(f"Font {key} was not registered at startup")
+        # Prefer a bundled TTF (fonts/Arial-Bold.ttf) so startup doesn't need a system font scan
+        path = os.path.join(self.font_dir, f"{family}-Bold.ttf" if bold else f"{family}.ttf")
+        try: self.fonts[key] = pygame.font.Font(path, size)
+        except: self.fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+        return self.fonts[key]
+
+    def freeze(self): self.frozen = True
+
+fonts = FontRegistry(os.path.join(script_dir, "fonts"))
+font = fonts.load("Arial", 26, bold=True)
+title_font = fonts.load("Arial", 42, bold=True)
+small_font = fonts.load("Arial", 18, bold=True)
+tiny_font = fonts.load("Arial", 11, bold=True)
+fonts.freeze()
+
 # Persistent files
-high_score_file = os.path.join(script_dir, "highscore.txt")
-bank_file = os.path.join(script_dir, "bank.txt")
+# Progress (high score, bank, wardrobe) lives in save.json; the first run migrates highscore.txt, bank.txt and wardrobe.txt.
+# Only a real game opens it (see the main loop), so importing this module (bench.py) never touches player data.
+save_file = os.path.join(script_dir, "save.json")
+# Every finished run, for the leaderboard (see history.py); also opened by the main loop only
+history_file = os.path.join(script_dir, "history.db")
+history = None
+# Input logs of the most recent run and of the high-score run (see replay.py)
+last_run_replay_file = os.path.join(script_dir, "last_run.replay")
+high_score_replay_file = os.path.join(script_dir, "highscore.replay")
 
 # --- SETTINGS & STATE ---
 volume = 0.5  # Default 50%
-state = 0     # 0: Menu, 1: Game, 2: Game Over, 3: Settings
+state = 0     # 0: Menu, 1: Game, 2: Game Over, 3: Settings, 4: Tailor, 5: Leaderboard
 diff_list = ["Easy", "Medium", "Difficult"]
 diff_idx = 1
 theme_idx = 0
@@ -35,57 +75,35 @@ BTN_BG, CYAN, PLAYER_RED = (45, 45, 45), (0, 255, 255), (255, 100, 100)
 DANGER_RED, PENNY_FILL, PENNY_HIGHLIGHT = (255, 60, 60), (184, 115, 51), (230, 170, 120)
 
 # --- SHOP DATA ---
-wardrobe_file = os.path.join(script_dir, "wardrobe.txt")
 # Format: Name, Color, Price
 SUITS = [("Navy", (40, 44, 52), 0), ("Charcoal", (60, 60, 60), 1000), ("Gold", (212, 175, 55), 5000), ("Emerald", (0, 100, 50), 10000),("Platinum", (229, 228, 226), 999900)]
 TIES = [("Red", DANGER_RED, 0), ("Blue", (50, 50, 200), 500), ("Green", (50, 150, 50), 750), ("Pink", (255, 105, 180), 1200),("Diamond", (185, 242, 255), 999900)]
 
-owned_suits = ["Navy"]
-owned_ties = ["Red"]
-eq_suit_idx = 0
-eq_tie_idx = 0
-
-# Load unlocked items
-if os.path.exists(wardrobe_file):
-    try:
-        with open(wardrobe_file, "r") as f:
-            lines = f.read().splitlines()
-            owned_suits = lines[0].split(",")
-            owned_ties = lines[1].split(",")
-            eq_suit_idx = int(lines[2])
-            eq_tie_idx = int(lines[3])
-    except: pass
-
-def save_wardrobe():
-    with open(wardrobe_file, "w") as f:
-        f.write(f"{','.join(owned_suits)}\n{','.join(owned_ties)}\n{eq_suit_idx}\n{eq_tie_idx}")
-
-# --- HIGH SCORE & BANK SETUP ---
-high_score = 0
-if os.path.exists(high_score_file):
-    try:
-        with open(high_score_file, "r") as f:
-            high_score = int(f.read())
-    except: pass
-
-bank_cents = 0
-if os.path.exists(bank_file):
-    try:
-        with open(bank_file, "r") as f:
-            bank_cents = int(f.read())
-    except: bank_cents = 0
-
-def save_high_score(score):
-    try:
-        with open(high_score_file, "w") as f:
-            f.write(str(score))
-    except: pass
-
-def save_bank(cents):
-    try:
-        with open(bank_file, "w") as f:
-            f.write(str(int(cents)))
-    except: pass
+# --- PROGRESS ---
+# A fresh career until open_progress() loads the save over it
+store = None
+owned_suits = list(DEFAULTS["owned_suits"])
+owned_ties = list(DEFAULTS["owned_ties"])
+eq_suit_idx = DEFAULTS["eq_suit_idx"]
+eq_tie_idx = DEFAULTS["eq_tie_idx"]
+high_score = DEFAULTS["high_score"]
+bank_cents = DEFAULTS["bank_cents"]
+
+def open_progress():
+    global store, owned_suits, owned_ties, eq_suit_idx, eq_tie_idx, high_score, bank_cents
+    store = SaveStore(save_file, legacy_dir=script_dir)
+    owned_suits, owned_ties = list(store["owned_suits"]), list(store["owned_ties"])
+    eq_suit_idx, eq_tie_idx = store["eq_suit_idx"], store["eq_tie_idx"]
+    high_score, bank_cents = store["high_score"], store["bank_cents"]
+
+def save_progress():
+    # Only updates the store's in-memory copy; its writer thread puts it on disk. Everything goes in one
+    # snapshot, so a purchase's debit and the item it bought are committed together.
+    store.update(high_score=high_score, bank_cents=bank_cents, owned_suits=owned_suits, owned_ties=owned_ties,
+                 eq_suit_idx=eq_suit_idx, eq_tie_idx=eq_tie_idx)
+
+def save_replay(log, path):
+    store.write_file(path, log.to_bytes())
 
 def fmt_money(cents: int) -> str:
     dollars = cents // 100
@@ -93,572 +111,796 @@ def fmt_money(cents: int) -> str:
     return f"${dollars:,}.{rem:02d}"
 
 # --- ASSET LOADING ---
+# Everything starts as a fallback so the menu can show immediately; the loader thread swaps real art in.
+# Pre-scaled pixels come from assets.pack when it has been baked (python assets.py), PNGs otherwise.
 BG_IMAGES = []
-for name in bg_names:
-    path = os.path.join(script_dir, name)
-    try:
-        img = pygame.image.load(path).convert()
-        BG_IMAGES.append(pygame.transform.scale(img, (WIDTH, HEIGHT)))
-    except:
-        fallbacks = [(135, 206, 235), (20, 24, 82), (200, 230, 255)]
-        idx = len(BG_IMAGES)
-        fallback = pygame.Surface((WIDTH, HEIGHT))
-        fallback.fill(fallbacks[idx] if idx < len(fallbacks) else (40, 40, 60))
-        BG_IMAGES.append(fallback)
-try:
-    MONEY_BAG_IMG = pygame.image.load(os.path.join(script_dir, "moneybag.png")).convert_alpha()
-    MONEY_BAG_IMG = pygame.transform.scale(MONEY_BAG_IMG, (35, 35)) # Match your current size
-except: 
-    MONEY_BAG_IMG = None
-try:
-    PLAYER_IMG = pygame.image.load(os.path.join(script_dir, "character.png")).convert_alpha()
-    PLAYER_IMG = pygame.transform.scale(PLAYER_IMG, (25, 50))
-except: PLAYER_IMG = None
-
-try:
-    HELI_IMG = pygame.image.load(os.path.join(script_dir, "helicopter.png")).convert_alpha()
-    HELI_IMG = pygame.transform.scale(HELI_IMG, (60, 30))
-except: HELI_IMG = None
-
-try:
-    SHIELD_IMG = pygame.image.load(os.path.join(script_dir, "shield.png")).convert_alpha()
-    SHIELD_IMG = pygame.transform.scale(SHIELD_IMG, (30, 30))
-except: SHIELD_IMG = None
+for idx, color in enumerate([(135, 206, 235), (20, 24, 82), (200, 230, 255)][:len(bg_names)]):
+    fallback = pygame.Surface((WIDTH, HEIGHT))
+    fallback.fill(color)
+    BG_IMAGES.append(fallback)
+MONEY_BAG_IMG = PLAYER_IMG = HELI_IMG = SHIELD_IMG = None
+
+PLAT_FILES = {
+    "platform.png": "standard",
+    "horizontalplatform.png": "horiz",
+    "verticalplatform.png": "vert",
+    "snowplatform.png": "snow_std",
+    "snowyhorizontal.png": "snow_horiz",
+    "snowyvertical.png": "snow_vert",
+}
+PLAT_ASSETS = {key: None for key in PLAT_FILES.values()}
 
-# --- SOUNDS ---
-def load_sound(name):
-    try: return pygame.mixer.Sound(os.path.join(script_dir, name))
-    except: return None
+# Snowflake sprites for radius 2, 3 and 4 (indexed by radius - 2)
+def make_flake(rad):
+    flake = pygame.Surface((rad * 2, rad * 2)).convert()
+    flake.set_colorkey(BLACK)
+    pygame.draw.circle(flake, WHITE, (rad, rad), rad)
+    return flake
 
-SND_JUMP = load_sound("jump.mp3")
-SND_LAND = load_sound("land.ogg")
-SND_MENU = load_sound("menuclick.ogg")
-SND_DEATH = load_sound("death.ogg")
-SND_MONEY = load_sound("moneyearned.mp3")
-SND_PENNIES_LAND = load_sound("penniesland.mp3")
+FLAKE_SPRITES = [make_flake(rad) for rad in (2, 3, 4)]
+
+# --- SOUNDS ---
+SND_JUMP = "jump.mp3"
+SND_LAND = "land.ogg"
+SND_MENU = "menuclick.ogg"
+SND_DEATH = "death.ogg"
+SND_MONEY = "moneyearned.mp3"
+SND_PENNIES_LAND = "penniesland.mp3"
+# Mixer channels per category and whether a new sound cuts off the oldest one when they're all busy.
+# The player's own sounds never share with the penny volley; a volley's extra landings are just dropped.
+SOUND_CATEGORIES = {"player": (2, True), "pickup": (2, True), "hazard": (2, False), "ui": (1, True), "death": (1, True)}
+SOUND_ROUTES = {SND_JUMP: "player", SND_LAND: "player", SND_MONEY: "pickup", SND_PENNIES_LAND: "hazard",
+                SND_MENU: "ui", SND_DEATH: "death"}
+sounds = SoundManager(SOUND_CATEGORIES, volume)
 
 def play(sound):
-    if sound:
-        sound.set_volume(volume)
-        sound.play()
-
-def load_plat(name):
-    try:
-        path = os.path.join(script_dir, name)
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(img, (100, 18))
-    except: return None
-
-PLAT_ASSETS = {
-    "standard": load_plat("platform.png"),
-    "horiz": load_plat("horizontalplatform.png"),
-    "vert": load_plat("verticalplatform.png"),
-    "snow_std": load_plat("snowplatform.png"),
-    "snow_horiz": load_plat("snowyhorizontal.png"),
-    "snow_vert": load_plat("snowyvertical.png"),
-}
+    sounds.play(sound)
+
+def adopt_asset(name, obj):
+    global MONEY_BAG_IMG, PLAYER_IMG, HELI_IMG, SHIELD_IMG
+    if name in bg_names:
+        if obj: BG_IMAGES[bg_names.index(name)] = obj; idle.invalidate()
+        return
+    if name in SOUND_ROUTES: sounds.add(name, obj, SOUND_ROUTES[name]); return
+    if name in PLAT_FILES: PLAT_ASSETS[PLAT_FILES[name]] = obj
+    elif name == "moneybag.png": MONEY_BAG_IMG = obj
+    elif name == "character.png": PLAYER_IMG = obj
+    elif name == "helicopter.png": HELI_IMG = obj
+    elif name == "shield.png": SHIELD_IMG = obj
+    if obj: ATLAS.update(atlas_sprites())
+
+# Backgrounds and the menu click first, gameplay art next, the rest of the sounds last
+GAMEPLAY_ASSETS = list(PLAT_FILES) + ["helicopter.png", "shield.png", "moneybag.png"]
+asset_loader = assets.AssetLoader(assets.load_pack(),
+    [(name, "image") for name in bg_names] + [(SND_MENU, "sound")]
+    + [(name, "image") for name in GAMEPLAY_ASSETS + ["character.png"]]
+    + [(name, "sound") for name in (SND_JUMP, SND_LAND, SND_DEATH, SND_MONEY, SND_PENNIES_LAND)],
+    adopt_asset)
+
+# --- PLAYER SPRITES ---
+# One composited banker per (suit, tie, shield); square so the 38px shield ring fits around the center
+PLAYER_SPRITE_SIZE = 80
+PLAYER_SPRITES = {}
+
+def get_player_sprite(suit_idx, tie_idx, shield):
+    key = (suit_idx, tie_idx, shield)
+    if key in PLAYER_SPRITES: return PLAYER_SPRITES[key]
+    sprite = pygame.Surface((PLAYER_SPRITE_SIZE, PLAYER_SPRITE_SIZE), pygame.SRCALPHA)
+    w, h = 25, 50
+    c = PLAYER_SPRITE_SIZE // 2
+    x, y = c - w // 2, c - h // 2
+
+    # 1. DRAW BODY (The Suit)
+    pygame.draw.rect(sprite, SUITS[suit_idx][1], (x, y + 15, w, h - 15), border_radius=3)
+
+    # 2. DRAW HEAD
+    pygame.draw.rect(sprite, (255, 219, 172), (x + 5, y, w - 10, 15), border_radius=4)
+
+    # 3. DRAW THE SHIRT & TIE
+    pygame.draw.polygon(sprite, WHITE, [(x + 5, y + 15), (x + 20, y + 15), (x + 12, y + 25)])
+    pygame.draw.line(sprite, TIES[tie_idx][1], (x + 12, y + 15), (x + 12, y + 28), 3)
+
+    # 4. EYES & SHIELD
+    pygame.draw.circle(sprite, BLACK, (x + 8, y + 6), 2)
+    pygame.draw.circle(sprite, BLACK, (x + 17, y + 6), 2)
+    if shield:
+        pygame.draw.circle(sprite, CYAN, (c, c), 38, 3)
+
+    PLAYER_SPRITES[key] = sprite
+    return sprite
+
+# --- SPRITE VARIANTS ---
+class SpriteVariantCache:
+    # Flipped / rotated / tinted copies of a sprite, built once and kept under a byte budget (LRU eviction)
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def get(self, sprite, flip_x=False, flip_y=False, angle=0, tint=None):
+        key = (sprite, flip_x, flip_y, angle % 360, tint)
+        img = self.entries.get(key)
+        if img is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return img
+        self.misses += 1
+        img = sprite
+        if flip_x or flip_y: img = pygame.transform.flip(img, flip_x, flip_y)
+        if angle % 360: img = pygame.transform.rotate(img, angle)
+        if tint is not None:
+            img = img.copy()
+            img.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+        self.entries[key] = img
+        self.bytes += img.get_pitch() * img.get_height()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return img
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries), "bytes": self.bytes}
+
+sprite_variants = SpriteVariantCache()
+
+# --- TEXTURE ATLAS ---
+# All world-layer sprites live in one surface; entities bind their region at spawn and blit from ATLAS.surface.
+# Missing art is replaced by the old primitive fallbacks, baked into the atlas too.
+def make_fallback(size, paint):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    paint(surf)
+    return surf
+
+def paint_money_bag(surf):
+    pygame.draw.ellipse(surf, (34, 139, 34), (0, 10, 35, 25))
+    label = small_font.render("$", True, GOLD)
+    surf.blit(label, label.get_rect(center=(17, 17)))
+
+def paint_shield(surf):
+    pygame.draw.circle(surf, CYAN, (15, 15), 15)
+    pygame.draw.circle(surf, WHITE, (15, 15), 15, 2)
+
+plat_fallback = make_fallback((100, 18), lambda surf: surf.fill((100, 100, 105)))
+heli_fallback = make_fallback((60, 30), lambda surf: pygame.draw.rect(surf, (30, 50, 100), surf.get_rect(), border_radius=5))
+shield_fallback = make_fallback((30, 30), paint_shield)
+money_bag_fallback = make_fallback((35, 35), paint_money_bag)
+
+def atlas_sprites():
+    heli = HELI_IMG or heli_fallback
+    return {
+        **{key: PLAT_ASSETS.get(key) or PLAT_ASSETS["standard"] or plat_fallback for key in PLAT_ASSETS},
+        "heli": heli,
+        "heli_left": sprite_variants.get(heli, flip_x=True) if HELI_IMG else heli,
+        "shield": SHIELD_IMG or shield_fallback,
+        "money_bag": MONEY_BAG_IMG or money_bag_fallback,
+    }
+
+ATLAS = assets.TextureAtlas(atlas_sprites())
+# [snow theme][move_type] -> atlas region
+PLAT_REGIONS = ((ATLAS["standard"], ATLAS["horiz"], ATLAS["vert"]), (ATLAS["snow_std"], ATLAS["snow_horiz"], ATLAS["snow_vert"]))
+HELI_REGIONS = (ATLAS["heli_left"], ATLAS["heli"])  # [facing right]
+
+def lerp_pos(e, alpha):
+    # Where to draw an entity `alpha` of the way from its previous tick to its current one
+    px, py, r = e.prev_x, e.prev_y, e.rect
+    return (round(px + (r.x - px) * alpha), round(py + (r.y - py) * alpha))
+
+def draw_platforms(surface, platforms, bg_index, alpha=1.0):
+    regions = PLAT_REGIONS[bg_index == 2]
+    surface.blits([(ATLAS.surface, lerp_pos(p, alpha), regions[p.move_type]) for p in platforms], doreturn=False)
 
+# --- CLASSES ---
 
+class SnowField:
+    # Struct-of-arrays flakes: only the first `count` slots are live
+    def __init__(self, capacity=3000, count=80):
+        self.capacity, self.count = capacity, count
+        self.x = np.random.uniform(0, WIDTH, capacity)
+        self.y = np.random.uniform(0, HEIGHT, capacity)
+        self.vy = np.random.uniform(1, 3, capacity)
+        self.rad = np.random.randint(2, 5, capacity)
+        self.sprites = [FLAKE_SPRITES[r - 2] for r in self.rad.tolist()]
 
-# --- CLASSES ---
+    def set_density(self, height_ft):
+        # Blizzard gets heavier the higher you climb
+        self.count = min(self.capacity, 80 + height_ft // 2)
+
+    def update(self, scroll_speed):
+        n = self.count
+        y = self.y[:n]
+        y += self.vy[:n] + (scroll_speed if scroll_speed > 0 else 0)
+        fallen = y > HEIGHT
+        if fallen.any():
+            y[fallen] = -10
+            self.x[:n][fallen] = np.random.randint(0, WIDTH + 1, int(fallen.sum()))
+
+    def draw(self, surface):
+        n = self.count
+        xs = (self.x[:n] - self.rad[:n]).astype(np.int32).tolist()
+        ys = (self.y[:n] - self.rad[:n]).astype(np.int32).tolist()
+        batch = zip(self.sprites[:n], zip(xs, ys))
+        if hasattr(surface, "fblits"): surface.fblits(batch)
+        else: surface.blits(batch, doreturn=False)
 
 class Environment:
     def __init__(self, bg_index):
         self.bg_y = 0
         self.bg_index = bg_index
-        self.snow_particles = [[random.randint(0, WIDTH), random.randint(0, HEIGHT), random.uniform(1, 3), random.randint(2, 4)] for _ in range(80)]
+        self.snow = SnowField()
         self.clouds = []
         for _ in range(6):
             scale = random.uniform(0.6, 1.2)
             offsets = [(random.randint(-20, 20) * scale, random.randint(-10, 10) * scale, random.randint(15, 25) * scale) for _ in range(4)]
             self.clouds.append([random.randint(0, WIDTH), random.randint(0, 400), random.uniform(0.2, 0.5), scale, offsets])
+        # Baked cloud sprites per alpha variant (day/snow: 100, night: 60)
+        self.cloud_cache = {}
+        self.cloud_sprites, self.cloud_bg = None, None
 
-    def draw(self, surface, scroll_speed):
-        self.bg_y += scroll_speed * 0.5
-        if self.bg_y >= 0: self.bg_y = 0
-        surface.blit(BG_IMAGES[self.bg_index], (0, int(self.bg_y)))
-
-        if self.bg_index == 2:
-            for flake in self.snow_particles:
-                flake[1] += flake[2] + (scroll_speed if scroll_speed > 0 else 0)
-                if flake[1] > HEIGHT: flake[1], flake[0] = -10, random.randint(0, WIDTH)
-                pygame.draw.circle(surface, (255, 255, 255, 180), (int(flake[0]), int(flake[1])), flake[3])
-
+    def bake_clouds(self, alpha):
+        # Composite each cloud's puffs into one sprite so drawing a cloud is a single blit
+        sprites = []
         for c in self.clouds:
-            c[0] = (c[0] + c[2]) % (WIDTH + 100)
+            left = min(ox - rad for ox, oy, rad in c[4]); top = min(oy - rad for ox, oy, rad in c[4])
+            right = max(ox + rad for ox, oy, rad in c[4]); bottom = max(oy + rad for ox, oy, rad in c[4])
+            cloud_surf = pygame.Surface((int(right - left) + 2, int(bottom - top) + 2), pygame.SRCALPHA)
             for ox, oy, rad in c[4]:
-                cloud_surf = pygame.Surface((rad * 2, rad * 2), pygame.SRCALPHA)
-                alpha = 100 if self.bg_index != 1 else 60
-                pygame.draw.circle(cloud_surf, (255, 255, 255, alpha), (rad, rad), rad)
-                surface.blit(cloud_surf, (int(c[0] + ox - rad), int(c[1] + oy - rad)))
-
-class Player:
-    def __init__(self):
-        self.rect = pygame.Rect(200, 500, 25, 50)
-        self.vel_y = 0
-        self.height_ft = 0
-        self.pixels_climbed = 0
-        self.on_ground = False
-        self.current_platform = None
-        self.has_shield = False
-        self.invincible = False
-        self.invincible_timer = 0
-        self.run_cents = 0
-        self.last_bonus_bucket = 0
-
-    def draw(self, surface):
-        if self.invincible and (pygame.time.get_ticks() // 100) % 2 == 0:
-            return
-
-        x, y = self.rect.x, self.rect.y
-        w, h = self.rect.width, self.rect.height
-        
-        # Use currently equipped colors
-        current_suit_color = SUITS[eq_suit_idx][1]
-        current_tie_color = TIES[eq_tie_idx][1]
-
-        # 1. DRAW BODY (The Suit)
-        pygame.draw.rect(surface, current_suit_color, (x, y + 15, w, h - 15), border_radius=3)
-
-        # 2. DRAW HEAD
-        pygame.draw.rect(surface, (255, 219, 172), (x + 5, y, w - 10, 15), border_radius=4)
-
-        # 3. DRAW THE SHIRT & TIE
-        pygame.draw.polygon(surface, WHITE, [(x + 5, y + 15), (x + 20, y + 15), (x + 12, y + 25)])
-        pygame.draw.line(surface, current_tie_color, (x + 12, y + 15), (x + 12, y + 28), 3)
-
-        # 4. EYES & SHIELD
-        pygame.draw.circle(surface, BLACK, (x + 8, y + 6), 2)
-        pygame.draw.circle(surface, BLACK, (x + 17, y + 6), 2)
-        if self.has_shield:
-            pygame.draw.circle(surface, CYAN, self.rect.center, 38, 3)
-
-    def jump(self):
-        if self.on_ground:
-            self.vel_y = -18
-            self.on_ground = False
-            self.current_platform = None
-            play(SND_JUMP)
-
-    def apply_gravity(self):
-        self.vel_y += 0.8
-        self.rect.y += self.vel_y
-
-    def update_invincibility(self):
-        if self.invincible and (pygame.time.get_ticks() - self.invincible_timer > 3000):
-            self.invincible = False
-
-    def update_height_and_money(self):
-        new_height = int(self.pixels_climbed // 10)
-        if new_height > self.height_ft:
-            delta = new_height - self.height_ft
-            self.height_ft = new_height
-            self.run_cents += delta 
-        bucket = self.height_ft // 250
-        if bucket > self.last_bonus_bucket:
-            self.run_cents += (bucket - self.last_bonus_bucket) * 500
-            self.last_bonus_bucket = bucket
-            play(SND_MONEY)
-
-class Platform:
-    def __init__(self, x, y, score, difficulty, prev_x=None):
-        if prev_x is not None:
-            x = random.randint(max(0, prev_x - 150), min(WIDTH - 100, prev_x + 150))
-        self.rect = pygame.Rect(x, y, 100, 18)
-        speed_mult = 1.8 if difficulty == "Difficult" else 1.2 if difficulty == "Medium" else 1.0
-        self.move_type = random.choice([0, 1, 2]) if score > 50 else random.choice([0, 1])
-        self.direction, self.speed = 1, random.randint(2, 3) * speed_mult
-        self.start_y, self.v_range = y, 60
-
-    def draw(self, surface, bg_index):
-        key = "standard"
-        if bg_index == 2:
-            if self.move_type == 1: key = "snow_horiz"
-            elif self.move_type == 2: key = "snow_vert"
-            else: key = "snow_std"
-        else:
-            if self.move_type == 1: key = "horiz"
-            elif self.move_type == 2: key = "vert"
-            else: key = "standard"
-        sprite = PLAT_ASSETS.get(key) or PLAT_ASSETS["standard"]
-        if sprite: surface.blit(sprite, (self.rect.x, self.rect.y))
-        else: pygame.draw.rect(surface, (100, 100, 105), self.rect)
-
-    def update(self, scroll_speed):
-        self.rect.y += scroll_speed
-        self.start_y += scroll_speed
-        if self.move_type == 1:
-            self.rect.x += self.direction * self.speed
-            if self.rect.right >= WIDTH or self.rect.left <= 0: self.direction *= -1
-        elif self.move_type == 2:
-            self.rect.y += self.direction * (self.speed // 2)
-            if abs(self.rect.y - self.start_y) > self.v_range: self.direction *= -1
-
-class HeliEnemy:
-    def __init__(self, score, difficulty):
-        self.rect = pygame.Rect(random.randint(0, WIDTH - 60), -100, 60, 30)
-        self.direction = random.choice([-1, 1])
-        base_speed = 2 if difficulty == "Easy" else 4 if difficulty == "Medium" else 6
-        self.speed = min(9, base_speed + (score / 200))
-
-    def update(self, scroll_vel):
-        self.rect.x += self.direction * self.speed
-        self.rect.y += scroll_vel
-        if self.rect.right >= WIDTH: self.direction = -1
-        elif self.rect.left <= 0: self.direction = 1
-
-    def draw(self, surface):
-        if HELI_IMG:
-            img = pygame.transform.flip(HELI_IMG, True, False) if self.direction == -1 else HELI_IMG
-            surface.blit(img, self.rect)
-        else: pygame.draw.rect(surface, (30, 50, 100), self.rect, border_radius=5)
-
-class ShieldItem:
-    def __init__(self, y):
-        self.rect = pygame.Rect(random.randint(50, WIDTH - 50), y, 30, 30)
-        self.collected = False
-    def update(self, scroll_vel): self.rect.y += scroll_vel
-    def draw(self, surface):
-        if not self.collected:
-            if SHIELD_IMG: surface.blit(SHIELD_IMG, self.rect)
-            else: 
-                pygame.draw.circle(surface, CYAN, self.rect.center, 15)
-                pygame.draw.circle(surface, WHITE, self.rect.center, 15, 2)
-
-class PennyWarning:
-    def __init__(self, x, w, delay_ms=900):
-        self.x, self.w, self.y, self.h = int(max(0, min(WIDTH - w, x))), int(w), 70, 26
-        self.spawn_time, self.delay_ms = pygame.time.get_ticks(), delay_ms
-    def ready_to_drop(self): return (pygame.time.get_ticks() - self.spawn_time) >= self.delay_ms
-    def draw(self, surface):
-        elapsed = pygame.time.get_ticks() - self.spawn_time
-        blink_rate = 140 if elapsed < self.delay_ms * 0.6 else 70
-        if (pygame.time.get_ticks() // blink_rate) % 2 == 0:
-            warn_surf = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-            warn_surf.fill((DANGER_RED[0], DANGER_RED[1], DANGER_RED[2], 85))
-            surface.blit(warn_surf, (self.x, self.y))
-            pygame.draw.rect(surface, DANGER_RED, (self.x, self.y, self.w, self.h), 3, border_radius=7)
-            for cx in range(self.x + 10, self.x + self.w - 10, 18):
-                pygame.draw.polygon(surface, DANGER_RED, [(cx, self.y + 6), (cx + 10, self.y + 6), (cx + 5, self.y + 18)])
-
-class Penny:
-    def __init__(self, x, y, speed):
-        self.x, self.y, self.speed, self.r = float(x), float(y), float(speed), 6
-        self.rect = pygame.Rect(0, 0, self.r * 2, self.r * 2)
-    def update(self):
-        self.y += self.speed
-        self.rect.center = (int(self.x), int(self.y))
-    def draw(self, surface):
-        pygame.draw.circle(surface, PENNY_FILL, (int(self.x), int(self.y)), self.r)
-        pygame.draw.circle(surface, (120, 75, 35), (int(self.x), int(self.y)), self.r, 2)
-        pygame.draw.circle(surface, PENNY_HIGHLIGHT, (int(self.x) - 2, int(self.y) - 2), 2)
+                puff = pygame.Surface((rad * 2, rad * 2), pygame.SRCALPHA)
+                pygame.draw.circle(puff, (255, 255, 255, alpha), (rad, rad), rad)
+                cloud_surf.blit(puff, (int(ox - rad - left), int(oy - rad - top)))
+            sprites.append((cloud_surf, int(left), int(top)))
+        return sprites
+
+    def get_cloud_sprites(self):
+        # Only re-resolve when the theme changes
+        if self.cloud_bg != self.bg_index:
+            alpha = 100 if self.bg_index != 1 else 60
+            if alpha not in self.cloud_cache: self.cloud_cache[alpha] = self.bake_clouds(alpha)
+            self.cloud_sprites, self.cloud_bg = self.cloud_cache[alpha], self.bg_index
+        return self.cloud_sprites
+
+    def move_clouds(self, steps=1):
+        for c in self.clouds: c[0] = (c[0] + c[2] * steps) % (WIDTH + 100)
+
+    def cloud_rects(self):
+        return [pygame.Rect(int(c[0]) + left, int(c[1]) + top, cloud_surf.get_width(), cloud_surf.get_height())
+                for c, (cloud_surf, left, top) in zip(self.clouds, self.get_cloud_sprites())]
+
+    def draw_clouds(self, surface):
+        for c, (cloud_surf, left, top) in zip(self.clouds, self.get_cloud_sprites()):
+            surface.blit(cloud_surf, (int(c[0]) + left, int(c[1]) + top))
+
+    def advance(self, scroll_speed):
+        # One 60 Hz tick of background motion
+        self.bg_y += scroll_speed * 0.5
+        if self.bg_y >= 0: self.bg_y = 0
+        if self.bg_index == 2: self.snow.update(scroll_speed)
+        self.move_clouds()
 
-class MoneyBag:
-    def __init__(self, y):
-        # We'll keep it 35x35 to match your current layout
-        self.rect = pygame.Rect(random.randint(50, WIDTH - 50), y, 35, 35)
-        self.collected = False
-        self.value = 500  # $5.00
+    def render(self, surface):
+        surface.blit(BG_IMAGES[self.bg_index], (0, int(self.bg_y)))
+        if self.bg_index == 2: self.snow.draw(surface)
+        self.draw_clouds(surface)
 
-    def update(self, scroll_vel):
-        self.rect.y += scroll_vel
+    def draw(self, surface, scroll_speed):
+        self.advance(scroll_speed)
+        self.render(surface)
+
+    def draw_idle(self, surface, overlay, steps=1):
+        # Static screens: move the clouds and repaint only the rects they left or entered
+        before = self.cloud_rects()
+        self.move_clouds(steps)
+        dirty = []
+        for old, new in zip(before, self.cloud_rects()):
+            if old != new: dirty += [r for r in (old.clip(surface.get_rect()), new.clip(surface.get_rect())) if r.width and r.height]
+        for r in dirty:
+            surface.set_clip(r)
+            surface.blit(BG_IMAGES[self.bg_index], (0, int(self.bg_y)))
+            self.draw_clouds(surface)
+            surface.blit(overlay, (0, 0))
+        surface.set_clip(None)
+        return dirty
+
+# Warning banners baked once per width (the sim snaps widths to sim.WARNING_BUCKET); the "off" blink phase draws nothing
+WARNING_BANNERS = {}
+
+def get_warning_banner(w, h):
+    key = (w, h)
+    if key not in WARNING_BANNERS:
+        banner = pygame.Surface((w, h), pygame.SRCALPHA)
+        banner.fill((DANGER_RED[0], DANGER_RED[1], DANGER_RED[2], 85))
+        pygame.draw.rect(banner, DANGER_RED, (0, 0, w, h), 3, border_radius=7)
+        for cx in range(10, w - 10, 18):
+            pygame.draw.polygon(banner, DANGER_RED, [(cx, 6), (cx + 10, 6), (cx + 5, 18)])
+        WARNING_BANNERS[key] = banner
+    return WARNING_BANNERS[key]
+
+# One pre-rendered coin; the whole penny list is drawn with a single blits call
+PENNY_SPRITE_HALF = 7
+
+def make_penny_sprite(r=6):
+    c = PENNY_SPRITE_HALF
+    coin = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA)
+    pygame.draw.circle(coin, PENNY_FILL, (c, c), r)
+    pygame.draw.circle(coin, (120, 75, 35), (c, c), r, 2)
+    pygame.draw.circle(coin, PENNY_HIGHLIGHT, (c - 2, c - 2), 2)
+    return coin
+
+PENNY_IMG = make_penny_sprite()
+
+def draw_pennies(surface, pennies, alpha=1.0):
+    n = pennies.count
+    if n:
+        xs = (pennies.x[:n] - PENNY_SPRITE_HALF).astype(np.int32).tolist()
+        ys = (pennies.prev_y[:n] + (pennies.y[:n] - pennies.prev_y[:n]) * alpha - PENNY_SPRITE_HALF).astype(np.int32).tolist()
+        batch = zip([PENNY_IMG] * n, zip(xs, ys))
+        if hasattr(surface, "fblits"): surface.fblits(batch)
+        else: surface.blits(batch, doreturn=False)
 
-    def draw(self, surface):
-        if not self.collected:
-            if MONEY_BAG_IMG:
-                # Draw the cool pixel art image
-                surface.blit(MONEY_BAG_IMG, self.rect)
-            else:
-                # Fallback in case the image file is missing
-                pygame.draw.ellipse(surface, (34, 139, 34), (self.rect.x, self.rect.y + 10, 35, 25))
-                draw_text("$", small_font, GOLD, self.rect.centerx, self.rect.centery)
 # --- GAME FUNCTIONS ---
 
-def reset_game(difficulty, theme_idx):
-    p, env = Player(), Environment(theme_idx)
-    plats, last_x, curr_y = [], 150, 550
-    gap = 100 if difficulty == "Easy" else 130 if difficulty == "Medium" else 155
-    for i in range(7):
-        new_plat = Platform(last_x, curr_y, 0, difficulty, prev_x=None if i == 0 else last_x)
-        plats.append(new_plat)
-        last_x, curr_y = new_plat.rect.x, curr_y - gap
-    
-    # NEW: Return empty lists for everything that could kill you
-    return p, plats, [], env, [], 0, [], [], []
-
-def draw_text(text, font_obj, color, x, y, shadow=False):
-    if shadow:
-        s_img = font_obj.render(text, True, BLACK)
-        screen.blit(s_img, s_img.get_rect(center=(x + 2, y + 2)))
-    img = font_obj.render(text, True, color)
-    rect = img.get_rect(center=(x, y))
-    screen.blit(img, rect)
+class TextCache:
+    # Bounded LRU of rendered labels, shadow already composited in
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def get(self, text, font_obj, color, shadow):
+        key = (text, font_obj, tuple(color), shadow)
+        img = self.entries.get(key)
+        if img is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return img
+        self.misses += 1
+        img = font_obj.render(text, True, color)
+        if shadow:
+            s_img = font_obj.render(text, True, BLACK)
+            combined = pygame.Surface((img.get_width() + 2, img.get_height() + 2), pygame.SRCALPHA)
+            combined.blit(s_img, (2, 2)); combined.blit(img, (0, 0))
+            img = combined
+        self.entries[key] = img
+        if len(self.entries) > self.maxsize: self.entries.popitem(last=False)
+        return img
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "hit_rate": self.hits / total if total else 0.0}
+
+text_cache = TextCache()
+
+def draw_text(text, font_obj, color, x, y, shadow=False, surface=None):
+    img = text_cache.get(text, font_obj, color, shadow)
+    # Position by the foreground glyphs; the shadow hangs 2px off the bottom-right
+    rect = pygame.Rect(0, 0, img.get_width() - (2 if shadow else 0), img.get_height() - (2 if shadow else 0))
+    rect.center = (x, y)
+    (screen if surface is None else surface).blit(img, rect.topleft)
     return rect
 
 def draw_styled_button(surface, text, rect):
     pygame.draw.rect(surface, BTN_BG, rect, border_radius=12)
     pygame.draw.rect(surface, WHITE, rect, width=3, border_radius=12)
-    draw_text(text, font, WHITE, rect.centerx, rect.centery)
-
-def get_drop_width(difficulty: str, height_ft: int) -> int:
-    if difficulty == "Easy": base, growth, cap = 75, 0.85, 170
-    elif difficulty == "Medium": base, growth, cap = 120, .5, 180
-    else: base, growth, cap = 150, 1.6, 320
-    return max(70, min(cap, int(base + height_ft * growth * 0.06)))
-
-
+    draw_text(text, font, WHITE, rect.centerx, rect.centery, surface=surface)
+
+# --- RENDERING ---
+# Gameplay frames are drawn purely from GameSim state; nothing here changes the sim
+SIM_SOUNDS = {"jump": SND_JUMP, "land": SND_LAND, "money": SND_MONEY, "pennies": SND_PENNIES_LAND, "death": SND_DEATH}
+
+def draw_warning(surface, warn, now_ms):
+    elapsed = now_ms - warn.spawn_time
+    blink_rate = 140 if elapsed < warn.delay_ms * 0.6 else 70
+    if (int(now_ms) // blink_rate) % 2 == 0:
+        surface.blit(get_warning_banner(warn.w, warn.h), (warn.x, warn.y))
+
+def draw_player(surface, player, now_ms, alpha=1.0):
+    if player.invincible and (int(now_ms) // 100) % 2 == 0:
+        return
+    sprite = get_player_sprite(eq_suit_idx, eq_tie_idx, player.has_shield)
+    x, y = lerp_pos(player, alpha)
+    surface.blit(sprite, sprite.get_rect(center=(x + player.rect.width // 2, y + player.rect.height // 2)))
+
+def draw_hud(player):
+    draw_text(f"Height: {player.height_ft}ft", font, WHITE, 90, 30, True)
+    draw_text(f"Earned: {fmt_money(player.run_cents)}", small_font, GOLD, 95, 60, True)
+    draw_text(f"Bank: {fmt_money(bank_cents)}", small_font, WHITE, WIDTH - 95, 30, True)
+    if player.has_shield: draw_text("SHIELD", small_font, CYAN, WIDTH - 95, 55, True)
+
+def draw_game(surface, sim, env, alpha=1.0, prof=None):
+    # env is advanced per tick by the caller; alpha interpolates entities between the last two ticks
+    env.snow.set_density(sim.player.height_ft)
+    env.render(surface)
+    if prof: prof.lap("env.draw")
+    for warn in sim.penny_warnings: draw_warning(surface, warn, sim.time_ms)
+    if prof: prof.lap("draw.penny_warnings")
+    draw_pennies(surface, sim.pennies, alpha)
+    if prof: prof.lap("draw.pennies")
+    for s in sim.shields:
+        if not s.collected: surface.blit(ATLAS.surface, lerp_pos(s, alpha), ATLAS["shield"])
+    if prof: prof.lap("draw.shields")
+    for mb in sim.money_bags:
+        if not mb.collected: surface.blit(ATLAS.surface, lerp_pos(mb, alpha), ATLAS["money_bag"])
+    if prof: prof.lap("draw.money_bags")
+    draw_platforms(surface, sim.platforms, env.bg_index, alpha)
+    if prof: prof.lap("draw.platforms")
+    for h in sim.helis: surface.blit(ATLAS.surface, lerp_pos(h, alpha), HELI_REGIONS[h.direction == 1])
+    if prof: prof.lap("draw.helicopters")
+    draw_player(surface, sim.player, sim.time_ms, alpha)
+    if prof: prof.lap("draw.player")
+    draw_hud(sim.player)
+    if prof: prof.lap("hud")
+
+# --- PROFILER OVERLAY ---
+# F3 toggles it during gameplay; F4 dumps the captured window to profile_<time>.csv next to the game. While it's off the
+# loop hands prof=None to everything, so the only cost left is one None check per section.
+class ProfilerOverlay:
+    GRAPH_W, GRAPH_H = 240, 50
+    BUDGET_MS = 1000 / 60  # Graph midline
+    REFRESH = 15  # Frames between text panel rebuilds; numbers that change every frame are unreadable anyway
+    NOTICE_SECS = 4  # How long the F4 result stays on the panel
+
+    def __init__(self, window=600):
+        self.window, self.enabled = window, False
+        self.prof, self.panel, self.panel_age = FrameProfiler(window), None, 0
+        self.notice, self.notice_until = None, 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.prof, self.panel = FrameProfiler(self.window), None
+
+    def dump_csv(self):
+        # The result goes on the panel, since nobody at the game is watching stdout
+        path = os.path.join(script_dir, time.strftime("profile_%Y%m%d_%H%M%S.csv"))
+        try:
+            self.prof.write_csv(path)
+            self.notice = (f"saved {path}", CYAN)
+        except OSError as exc: self.notice = (f"could not write {path}: {exc.strerror or exc}", DANGER_RED)
+        self.notice_until, self.panel = time.perf_counter() + self.NOTICE_SECS, None
+
+    def build_panel(self, sim, env):
+        # Rows are (label, mean ms, max ms, color) over the last second or so of frames
+        recent = list(self.prof.frames)[-60:]
+        rows = []
+        if recent:
+            frame_ms = sum(f["frame"] for f in recent) / len(recent) * 1000
+            rows.append((f"frame ({1000 / max(frame_ms, 0.001):.0f} fps)", "mean", "max", WHITE))
+            for name in self.prof.sections():
+                mean = sum(f.get(name, 0.0) for f in recent) / len(recent) * 1000
+                peak = max(f.get(name, 0.0) for f in recent) * 1000
+                color = WHITE if name == "frame" else GOLD if peak > self.BUDGET_MS / 4 else (200, 200, 200)
+                rows.append((name, f"{mean:.3f}", f"{peak:.3f}", color))
+        rows.append((f"plat {len(sim.platforms)}  heli {len(sim.helis)}  penny {len(sim.pennies)}  warn {len(sim.penny_warnings)}", "", "", CYAN))
+        rows.append((f"shield {len(sim.shields)}  bag {len(sim.money_bags)}  snow {env.snow.count}", "", "", CYAN))
+        if self.notice and time.perf_counter() < self.notice_until:
+            # Full paths are wider than the panel: wrap them character by character
+            text, color = self.notice
+            while text:
+                n = len(text)
+                while n > 1 and tiny_font.size(text[:n])[0] > self.GRAPH_W - 8: n -= 1
+                rows.append((text[:n], "", "", color)); text = text[n:]
+
+        line_h = tiny_font.get_linesize()
+        panel = pygame.Surface((self.GRAPH_W, line_h * len(rows) + 6), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, (label, mean, peak, color) in enumerate(rows):
+            y = 3 + i * line_h
+            panel.blit(tiny_font.render(label, True, color), (4, y))
+            for text, right in ((mean, self.GRAPH_W - 60), (peak, self.GRAPH_W - 6)):
+                if text:
+                    img = tiny_font.render(text, True, color)
+                    panel.blit(img, (right - img.get_width(), y))
+        return panel
+
+    def draw(self, surface, sim, env):
+        if self.panel is None or self.panel_age >= self.REFRESH:
+            self.panel, self.panel_age = self.build_panel(sim, env), 0
+        self.panel_age += 1
+        x, y = 8, 90
+        surface.blit(self.panel, (x, y))
+
+        # Rolling graphs: whole frame (green) and the frame minus the clock.tick wait (yellow), newest on the right
+        y += self.panel.get_height() + 4
+        graph = pygame.Rect(x, y, self.GRAPH_W, self.GRAPH_H)
+        surface.fill((0, 0, 0), graph)
+        scale = self.GRAPH_H / 2 / self.BUDGET_MS
+        pygame.draw.line(surface, (90, 90, 90), (graph.left, graph.centery), (graph.right - 1, graph.centery))
+        recent = list(self.prof.frames)[-self.GRAPH_W:]
+        if len(recent) > 1:
+            left = graph.right - len(recent)
+            for color, value in (((60, 220, 60), lambda f: f["frame"]), (GOLD, lambda f: f["frame"] - f.get("clock.tick", 0.0))):
+                points = [(left + i, graph.bottom - 1 - min(self.GRAPH_H - 1, value(f) * 1000 * scale)) for i, f in enumerate(recent)]
+                pygame.draw.lines(surface, color, False, points)
+
+overlay = ProfilerOverlay()
+
+# --- IDLE SCREENS ---
+IDLE_FPS = 20  # Menus only have slow clouds moving; 60 fps is wasted on them
+
+class IdleScreen:
+    # Menu UI is composited once into a layer; frames after that only repaint the cloud rects
+    def __init__(self):
+        self.layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.key = None
+
+    def invalidate(self): self.key = None
+
+    def present(self, surface, env, key, draw_ui):
+        key = (key, id(env), env.bg_index)
+        full = key != self.key
+        if full:
+            self.layer.fill((0, 0, 0, 0))
+            draw_ui(self.layer)
+            self.key = key
+        # Snow keeps the whole screen moving, so it still gets full-rate full-screen frames
+        if full or env.bg_index == 2:
+            env.draw(surface, 0)
+            surface.blit(self.layer, (0, 0))
+            pygame.display.flip()
+            return 60
+        dirty = env.draw_idle(surface, self.layer, 60 // IDLE_FPS)
+        if dirty: pygame.display.update(dirty)
+        return IDLE_FPS
+
+idle = IdleScreen()
+
+def idle_events(block=False):
+    # block=True sleeps until there is input instead of polling
+    events = ([pygame.event.wait()] if block else []) + pygame.event.get()
+    if any(e.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE) for e in events): idle.invalidate()
+    return events
+
+# Menu layout
+start_btn = pygame.Rect(WIDTH // 2 - 110, 220, 220, 50)
+shop_btn = pygame.Rect(WIDTH // 2 - 110, 290, 220, 50)
+settings_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 50)
+leaderboard_btn = pygame.Rect(WIDTH // 2 - 110, 430, 220, 50)
+vol_btn = pygame.Rect(WIDTH // 2 - 110, 200, 220, 55); diff_btn = pygame.Rect(WIDTH // 2 - 110, 280, 220, 55)
+theme_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 55); back_btn = pygame.Rect(WIDTH // 2 - 110, 460, 220, 55)
+retry_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 55)
+col_width, start_y, item_h, gap = 160, 130, 45, 8
+suit_rects = [(pygame.Rect(30, start_y + (i * (item_h + gap)), col_width, item_h), i) for i in range(len(SUITS))]
+tie_rects = [(pygame.Rect(210, start_y + (i * (item_h + gap)), col_width, item_h), i) for i in range(len(TIES))]
+tailor_back_btn = pygame.Rect(WIDTH // 2 - 70, 540, 140, 40)
+board_mode_btn = pygame.Rect(WIDTH // 2 - 110, 85, 220, 45)
+board_panel = pygame.Rect(20, 142, WIDTH - 40, 350)
+board_filters = diff_list + [None]  # None: every difficulty
+board_idx = diff_idx
+BOARD_SIZE = 10
+
+def draw_menu_ui(surface):
+    draw_text("WALL STREET", title_font, GOLD, WIDTH // 2, 80, True, surface)
+    draw_text("CLIMBER", title_font, GOLD, WIDTH // 2, 130, True, surface)
+    draw_text(f"BANK: {fmt_money(bank_cents)}", small_font, GOLD, WIDTH // 2, 175, True, surface)
+    draw_styled_button(surface, "START CAREER", start_btn)
+    draw_styled_button(surface, "THE TAILOR", shop_btn)
+    draw_styled_button(surface, "SETTINGS", settings_btn)
+    draw_styled_button(surface, "LEADERBOARD", leaderboard_btn)
+    if not asset_loader.finished:
+        done, total = asset_loader.progress
+        draw_text(f"Loading assets {done}/{total}", tiny_font, WHITE, WIDTH // 2, HEIGHT - 20, surface=surface)
+
+def draw_settings_ui(surface):
+    draw_text("SETTINGS", title_font, GOLD, WIDTH // 2, 100, True, surface)
+    draw_styled_button(surface, f"VOL: {int(volume*100)}%", vol_btn); draw_styled_button(surface, f"MODE: {diff_list[diff_idx]}", diff_btn)
+    draw_styled_button(surface, f"THEME: {theme_labels[theme_idx]}", theme_btn); draw_styled_button(surface, "BACK", back_btn)
+
+def draw_gameover_ui(surface):
+    draw_text("BANKRUPT!", title_font, PLAYER_RED, WIDTH // 2, 150, True, surface)
+    draw_text(f"Final Height: {sim.player.height_ft}ft", font, WHITE, WIDTH // 2, 220, True, surface)
+    draw_text(f"Earned: {fmt_money(last_run_cents)}", small_font, GOLD, WIDTH // 2, 255, True, surface)
+    draw_text(f"Total: {fmt_money(bank_cents)}", small_font, GOLD, WIDTH // 2, 285, True, surface)
+    draw_styled_button(surface, "MAIN MENU", retry_btn)
+
+def draw_tailor_ui(surface):
+    draw_text("THE TAILOR", title_font, GOLD, WIDTH // 2, 50, True, surface)
+    draw_text(f"BANK: {fmt_money(bank_cents)}", small_font, WHITE, WIDTH // 2, 85, True, surface)
+
+    # Draw Suit Column
+    draw_text("SUITS", small_font, GOLD, 100, 115, surface=surface)
+    for (rect, i), (name, color, price) in zip(suit_rects, SUITS):
+        bg_color = (60, 60, 80) if i == eq_suit_idx else BTN_BG
+        pygame.draw.rect(surface, bg_color, rect, border_radius=8)
+        pygame.draw.rect(surface, GOLD if i == eq_suit_idx else WHITE, rect, width=2, border_radius=8)
+        pygame.draw.circle(surface, color, (rect.x + 20, rect.centery), 10)
+        status_txt = "OWNED" if name in owned_suits else f"${price//100}"
+        draw_text(name, small_font, WHITE, rect.x + 85, rect.y + 12, surface=surface)
+        draw_text(status_txt, tiny_font, GOLD if "$" in status_txt else (150,150,150), rect.x + 85, rect.y + 30, surface=surface)
+
+    # Draw Tie Column
+    draw_text("TIES", small_font, GOLD, 300, 115, surface=surface)
+    for (rect, i), (name, color, price) in zip(tie_rects, TIES):
+        bg_color = (60, 60, 80) if i == eq_tie_idx else BTN_BG
+        pygame.draw.rect(surface, bg_color, rect, border_radius=8)
+        pygame.draw.rect(surface, GOLD if i == eq_tie_idx else WHITE, rect, width=2, border_radius=8)
+        pygame.draw.circle(surface, color, (rect.x + 20, rect.centery), 8)
+        status_txt = "OWNED" if name in owned_ties else f"${price//100}"
+        draw_text(name, small_font, WHITE, rect.x + 85, rect.y + 12, surface=surface)
+        draw_text(status_txt, tiny_font, GOLD if "$" in status_txt else (150,150,150), rect.x + 85, rect.y + 30, surface=surface)
+
+    # Preview & Back
+    preview = get_player_sprite(eq_suit_idx, eq_tie_idx, False); surface.blit(preview, preview.get_rect(center=(WIDTH // 2, 475)))
+    draw_styled_button(surface, "BACK", tailor_back_btn)
+
+def draw_leaderboard_ui(surface):
+    difficulty = board_filters[board_idx]
+    draw_text("LEADERBOARD", title_font, GOLD, WIDTH // 2, 50, True, surface)
+    draw_styled_button(surface, f"MODE: {difficulty or 'All'}", board_mode_btn)
+    pygame.draw.rect(surface, BTN_BG, board_panel, border_radius=8)
+    pygame.draw.rect(surface, WHITE, board_panel, width=2, border_radius=8)
+    runs = history.top(BOARD_SIZE, difficulty)
+    if not runs: draw_text("No finished runs yet", small_font, WHITE, WIDTH // 2, board_panel.centery, surface=surface)
+    for i, run in enumerate(runs):
+        y = 160 + i * 30
+        color = GOLD if i == 0 else WHITE
+        draw_text(f"{i + 1}.", small_font, color, 35, y, surface=surface)
+        draw_text(f"{run.height_ft:,}ft", small_font, color, 110, y, surface=surface)
+        draw_text(fmt_money(run.run_cents), small_font, color, 205, y, surface=surface)
+        draw_text(run.theme if difficulty else run.difficulty, tiny_font, (150, 150, 150), 290, y, surface=surface)
+        draw_text(run.death.upper(), tiny_font, (150, 150, 150), 355, y, surface=surface)
+    count = history.count(difficulty)
+    if count:
+        p50, p90 = history.percentile(50, difficulty), history.percentile(90, difficulty)
+        draw_text(f"{count:,} runs   median {p50:,}ft   top 10% {p90:,}ft", tiny_font, GOLD, WIDTH // 2, 475, surface=surface)
+    draw_styled_button(surface, "BACK", tailor_back_btn)
 
 # --- MAIN LOOP ---
-# This line sets the ID numbers for the timers
-enemy_timer, penny_timer = pygame.USEREVENT + 1, pygame.USEREVENT + 2
-
-# This line sets up the initial game state
-player, platforms, helis, env, shields, last_shield_spawn, pennies, penny_warnings, money_bags = reset_game(diff_list[diff_idx], theme_idx)
-
-last_run_cents, deposited_this_gameover, last_landed_platform_id = 0, False, None
-
-running = True
-while running:
-    # --- STATE 0: MAIN MENU ---
-    if state == 0:
-        deposited_this_gameover = False
-        env.bg_index = theme_idx
-        env.draw(screen, 0)
-        draw_text("WALL STREET", title_font, GOLD, WIDTH // 2, 80, True)
-        draw_text("CLIMBER", title_font, GOLD, WIDTH // 2, 130, True)
-        draw_text(f"BANK: {fmt_money(bank_cents)}", small_font, GOLD, WIDTH // 2, 175, True)
-
-        start_btn = pygame.Rect(WIDTH // 2 - 110, 220, 220, 50)
-        shop_btn = pygame.Rect(WIDTH // 2 - 110, 290, 220, 50)
-        settings_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 50)
-        
-        draw_styled_button(screen, "START CAREER", start_btn)
-        draw_styled_button(screen, "THE TAILOR", shop_btn)
-        draw_styled_button(screen, "SETTINGS", settings_btn)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: 
-                running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if start_btn.collidepoint(event.pos):
-                    # FIX: Added money_bags to the reset line
-                    player, platforms, helis, env, shields, last_shield_spawn, pennies, penny_warnings, money_bags = reset_game(diff_list[diff_idx], theme_idx)
-                    pygame.time.set_timer(enemy_timer, 3000) 
-                    pygame.time.set_timer(penny_timer, 6000) 
-                    play(SND_MENU)
-                    state = 1
-                elif shop_btn.collidepoint(event.pos):
-                    play(SND_MENU); state = 4
-                elif settings_btn.collidepoint(event.pos):
-                    play(SND_MENU); state = 3
-
-    # --- STATE 3: SETTINGS ---
-    elif state == 3:
-        env.draw(screen, 0)
-        draw_text("SETTINGS", title_font, GOLD, WIDTH // 2, 100, True)
-        vol_btn = pygame.Rect(WIDTH // 2 - 110, 200, 220, 55); diff_btn = pygame.Rect(WIDTH // 2 - 110, 280, 220, 55)
-        theme_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 55); back_btn = pygame.Rect(WIDTH // 2 - 110, 460, 220, 55)
-        draw_styled_button(screen, f"VOL: {int(volume*100)}%", vol_btn); draw_styled_button(screen, f"MODE: {diff_list[diff_idx]}", diff_btn)
-        draw_styled_button(screen, f"THEME: {theme_labels[theme_idx]}", theme_btn); draw_styled_button(screen, "BACK", back_btn)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if vol_btn.collidepoint(event.pos): volume = (volume + 0.1) if volume < 0.9 else 0.0; play(SND_MENU)
-                elif diff_btn.collidepoint(event.pos): diff_idx = (diff_idx + 1) % len(diff_list); play(SND_MENU)
-                elif theme_btn.collidepoint(event.pos): theme_idx = (theme_idx + 1) % len(theme_labels); env.bg_index = theme_idx; play(SND_MENU)
-                elif back_btn.collidepoint(event.pos): state = 0; play(SND_MENU)
-
-    # --- STATE 1: GAMEPLAY ---
-    elif state == 1:
-        scroll_vel = 0
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
-            if event.type == enemy_timer and len(helis) < 2:
-                helis.append(HeliEnemy(player.height_ft, diff_list[diff_idx]))
-            if event.type == penny_timer and len(penny_warnings) < 1:
-                w = get_drop_width(diff_list[diff_idx], player.height_ft)
-                penny_warnings.append(PennyWarning(random.randint(0, WIDTH - w), w, delay_ms=1500))
-                new_interval = max(3000, 6000 - int(player.height_ft * 1.0))
-                pygame.time.set_timer(penny_timer, new_interval)
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]: player.rect.x -= 8
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]: player.rect.x += 8
-        if keys[pygame.K_UP] or keys[pygame.K_w] or keys[pygame.K_SPACE]: player.jump()
-
-        player.apply_gravity(); player.update_invincibility()
-        if player.on_ground and player.current_platform:
-            if player.current_platform.move_type == 1: player.rect.x += player.current_platform.direction * player.current_platform.speed
-            if player.current_platform.move_type == 2: player.rect.bottom = player.current_platform.rect.top
-        player.rect.left = max(0, player.rect.left); player.rect.right = min(WIDTH, player.rect.right)
-
-        if player.rect.y <= 250 and player.vel_y < 0:
-            scroll_vel = abs(player.vel_y)
-            player.rect.y += scroll_vel; player.pixels_climbed += scroll_vel
-            player.update_height_and_money()
-            if player.height_ft > high_score: high_score = player.height_ft
-
-        # Shield Spawning
-        if player.height_ft > 0 and player.height_ft % 300 == 0 and player.height_ft > last_shield_spawn:
-            shields.append(ShieldItem(-50)); last_shield_spawn = player.height_ft
-
-        # MONEY BAG SPAWNING (Every 500ft)
-        if player.height_ft > 0 and player.height_ft % 500 == 0:
-            if not any(mb.rect.y < 0 for mb in money_bags): 
-                money_bags.append(MoneyBag(-50))
-
-        env.draw(screen, scroll_vel)
-
-        # Draw Penny Warnings
-        for warn in penny_warnings[:]:
-            warn.draw(screen)
-            if warn.ready_to_drop():
-                left, right = warn.x + 10, warn.x + warn.w - 10
-                span = max(1, right - left)
-                for i in range(5):
-                    px = max(left, min(right, left + int((i + 0.5) * span / 5) + random.randint(-6, 6)))
-                    pennies.append(Penny(px, warn.y - random.randint(40, 140), random.uniform(8.0, 12.0)))
-                play(SND_PENNIES_LAND); penny_warnings.remove(warn)
-
-        # Update Pennies
-        for pny in pennies[:]:
-            pny.update(); pny.draw(screen)
-            if pny.rect.colliderect(player.rect):
-                if player.invincible: pennies.remove(pny)
-                elif player.has_shield:
-                    player.has_shield, player.invincible, player.invincible_timer = False, True, pygame.time.get_ticks()
-                    pennies.remove(pny)
-                else: state = 2; play(SND_DEATH); save_high_score(high_score); break
-            if pny.y - pny.r > HEIGHT: pennies.remove(pny)
-
-        # Update Shields
-        for s in shields[:]:
-            s.update(scroll_vel); s.draw(screen)
-            if player.rect.colliderect(s.rect) and not s.collected:
-                player.has_shield, s.collected = True, True
-            if s.rect.top > HEIGHT: shields.remove(s)
-
-        # Update Money Bags
-        for mb in money_bags[:]:
-            mb.update(scroll_vel); mb.draw(screen)
-            if player.rect.colliderect(mb.rect) and not mb.collected:
-                mb.collected = True
-                player.run_cents += mb.value
-                play(SND_MONEY)
-                money_bags.remove(mb)
-            elif mb.rect.top > HEIGHT: money_bags.remove(mb)
-
-        # Platforms
-        player.on_ground = False; landed_this_frame = False
-        for plat in platforms:
-            plat.update(scroll_vel); plat.draw(screen, env.bg_index)
-            if player.vel_y >= 0 and player.rect.colliderect(plat.rect) and player.rect.bottom <= plat.rect.top + 20:
-                player.rect.bottom, player.vel_y, player.on_ground, player.current_platform = plat.rect.top, 0, True, plat
-                if id(plat) != last_landed_platform_id: landed_this_frame, last_landed_platform_id = True, id(plat)
-            if plat.rect.top > HEIGHT:
-                hy = min(p.rect.y for p in platforms)
-                hx = [p.rect.x for p in platforms if p.rect.y == hy][0]
-                plat.__init__(0, hy - (130 if diff_list[diff_idx] == "Easy" else 145 if diff_list[diff_idx] == "Medium" else 155), player.height_ft, diff_list[diff_idx], prev_x=hx)
-        if landed_this_frame: play(SND_LAND)
-
-        # Helicopters
-        for h in helis[:]:
-            h.update(scroll_vel); h.draw(screen)
-            if player.rect.colliderect(h.rect):
-                if not player.invincible:
-                    if player.has_shield: player.has_shield, player.invincible, player.invincible_timer = False, True, pygame.time.get_ticks()
-                    else: state = 2; play(SND_DEATH); save_high_score(high_score)
-            elif h.rect.top > HEIGHT: helis.remove(h)
-
-        player.draw(screen)
-        draw_text(f"Height: {player.height_ft}ft", font, WHITE, 90, 30, True)
-        draw_text(f"Earned: {fmt_money(player.run_cents)}", small_font, GOLD, 95, 60, True)
-        draw_text(f"Bank: {fmt_money(bank_cents)}", small_font, WHITE, WIDTH - 95, 30, True)
-        if player.has_shield: draw_text("SHIELD", small_font, CYAN, WIDTH - 95, 55, True)
-        if player.rect.top > HEIGHT: state = 2; play(SND_DEATH); save_high_score(high_score)
-
-    # --- STATE 2: GAME OVER ---
-    elif state == 2:
-        if not deposited_this_gameover:
-            last_run_cents = player.run_cents
-            bank_cents += last_run_cents
-            save_bank(bank_cents)
-            deposited_this_gameover = True
-            # CLEANUP
-            pygame.time.set_timer(penny_timer, 0)
-            pygame.time.set_timer(enemy_timer, 0)
-            pennies.clear(); penny_warnings.clear(); helis.clear(); money_bags.clear()
-
-        draw_text("BANKRUPT!", title_font, PLAYER_RED, WIDTH // 2, 150, True)
-        draw_text(f"Final Height: {player.height_ft}ft", font, WHITE, WIDTH // 2, 220, True)
-        draw_text(f"Earned: {fmt_money(last_run_cents)}", small_font, GOLD, WIDTH // 2, 255, True)
-        draw_text(f"Total: {fmt_money(bank_cents)}", small_font, GOLD, WIDTH // 2, 285, True)
-        
-        retry_btn = pygame.Rect(WIDTH // 2 - 110, 360, 220, 55)
-        draw_styled_button(screen, "MAIN MENU", retry_btn)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
-            if event.type == pygame.MOUSEBUTTONDOWN and retry_btn.collidepoint(event.pos):
-                play(SND_MENU); state = 0
-
-    # --- STATE 4: THE TAILOR ---
-    elif state == 4:
-        env.draw(screen, 0)
-        draw_text("THE TAILOR", title_font, GOLD, WIDTH // 2, 50, True)
-        draw_text(f"BANK: {fmt_money(bank_cents)}", small_font, WHITE, WIDTH // 2, 85, True)
-
-        col_width, start_y, item_h, gap = 160, 130, 45, 8
-        
-        # Draw Suit Column
-        draw_text("SUITS", small_font, GOLD, 100, 115)
-        suit_rects = []
-        for i, (name, color, price) in enumerate(SUITS):
-            rect = pygame.Rect(30, start_y + (i * (item_h + gap)), col_width, item_h)
-            suit_rects.append((rect, i))
-            bg_color = (60, 60, 80) if i == eq_suit_idx else BTN_BG
-            pygame.draw.rect(screen, bg_color, rect, border_radius=8)
-            pygame.draw.rect(screen, GOLD if i == eq_suit_idx else WHITE, rect, width=2, border_radius=8)
-            pygame.draw.circle(screen, color, (rect.x + 20, rect.centery), 10)
-            status_txt = "OWNED" if name in owned_suits else f"${price//100}"
-            draw_text(name, small_font, WHITE, rect.x + 85, rect.y + 12)
-            draw_text(status_txt, pygame.font.SysFont("Arial", 11, bold=True), GOLD if "$" in status_txt else (150,150,150), rect.x + 85, rect.y + 30)
-
-        # Draw Tie Column
-        draw_text("TIES", small_font, GOLD, 300, 115)
-        tie_rects = []
-        for i, (name, color, price) in enumerate(TIES):
-            rect = pygame.Rect(210, start_y + (i * (item_h + gap)), col_width, item_h)
-            tie_rects.append((rect, i))
-            bg_color = (60, 60, 80) if i == eq_tie_idx else BTN_BG
-            pygame.draw.rect(screen, bg_color, rect, border_radius=8)
-            pygame.draw.rect(screen, GOLD if i == eq_tie_idx else WHITE, rect, width=2, border_radius=8)
-            pygame.draw.circle(screen, color, (rect.x + 20, rect.centery), 8)
-            status_txt = "OWNED" if name in owned_ties else f"${price//100}"
-            draw_text(name, small_font, WHITE, rect.x + 85, rect.y + 12)
-            draw_text(status_txt, pygame.font.SysFont("Arial", 11, bold=True), GOLD if "$" in status_txt else (150,150,150), rect.x + 85, rect.y + 30)
-
-        # Preview & Back
-        preview_player = Player(); preview_player.rect.center = (WIDTH // 2, 475); preview_player.draw(screen)
-        back_btn = pygame.Rect(WIDTH // 2 - 70, 540, 140, 40); draw_styled_button(screen, "BACK", back_btn)
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                for r, index in suit_rects:
-                    if r.collidepoint(event.pos):
-                        target = SUITS[index]
-                        if target[0] in owned_suits: eq_suit_idx = index
-                        elif bank_cents >= target[2]: bank_cents -= target[2]; owned_suits.append(target[0]); eq_suit_idx = index; save_bank(bank_cents)
-                        save_wardrobe(); play(SND_MENU)
-                for r, index in tie_rects:
-                    if r.collidepoint(event.pos):
-                        target = TIES[index]
-                        if target[0] in owned_ties: eq_tie_idx = index
-                        elif bank_cents >= target[2]: bank_cents -= target[2]; owned_ties.append(target[0]); eq_tie_idx = index; save_bank(bank_cents)
-                        save_wardrobe(); play(SND_MENU)
-                if back_btn.collidepoint(event.pos): state = 0; play(SND_MENU)
-
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
\ No newline at end of file
+# Gameplay renders as fast as this (0 = uncapped); the sim always ticks at sim.TICK_HZ underneath
+RENDER_FPS = 144
+
+if __name__ == "__main__":
+    open_progress()
+    history = RunHistory(history_file)
+    # This line sets up the initial game state
+    sim, env = GameSim(diff_list[diff_idx]), Environment(theme_idx)
+    run_log, stepper = InputLog(sim.seed, sim.difficulty), FixedStep()
+
+    last_run_cents, deposited_this_gameover = 0, False
+
+    # python main.py --replay RUN.replay [--speed 2]: watch a recorded run instead of playing; nothing is saved
+    replay_inputs = None
+    if "--replay" in sys.argv:
+        run_log = InputLog.load(sys.argv[sys.argv.index("--replay") + 1])
+        speed = float(sys.argv[sys.argv.index("--speed") + 1]) if "--speed" in sys.argv else 1.0
+        asset_loader.wait_for(GAMEPLAY_ASSETS + [bg_names[theme_idx]])
+        sim, replay_inputs, stepper = GameSim(run_log.difficulty, run_log.seed), iter(run_log), FixedStep(speed)
+        state = 1
+
+    running = True
+    while running:
+        prof = overlay.prof if overlay.enabled and state == 1 else None
+        if prof: prof.begin_frame()
+        if not asset_loader.finished: asset_loader.poll()
+
+        # --- STATE 0: MAIN MENU ---
+        if state == 0:
+            deposited_this_gameover = False
+            env.bg_index = theme_idx
+            frame_rate = idle.present(screen, env, (0, bank_cents, asset_loader.progress), draw_menu_ui)
+
+            for event in idle_events():
+                if event.type == pygame.QUIT: 
+                    running = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if start_btn.collidepoint(event.pos):
+                        # Gameplay can't start on placeholder art; sounds may keep streaming in
+                        asset_loader.wait_for(GAMEPLAY_ASSETS + [bg_names[theme_idx]])
+                        sim, env = GameSim(diff_list[diff_idx]), Environment(theme_idx); stepper.reset()
+                        run_log = InputLog(sim.seed, sim.difficulty)
+                        play(SND_MENU)
+                        state = 1
+                    elif shop_btn.collidepoint(event.pos):
+                        play(SND_MENU); state = 4
+                    elif settings_btn.collidepoint(event.pos):
+                        play(SND_MENU); state = 3
+                    elif leaderboard_btn.collidepoint(event.pos):
+                        play(SND_MENU); state = 5
+
+        # --- STATE 3: SETTINGS ---
+        elif state == 3:
+            frame_rate = idle.present(screen, env, (3, volume, diff_idx, theme_idx), draw_settings_ui)
+            for event in idle_events():
+                if event.type == pygame.QUIT: running = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if vol_btn.collidepoint(event.pos):
+                        volume = (volume + 0.1) if volume < 0.9 else 0.0; sounds.set_volume(volume); play(SND_MENU)
+                    elif diff_btn.collidepoint(event.pos): diff_idx = (diff_idx + 1) % len(diff_list); play(SND_MENU)
+                    elif theme_btn.collidepoint(event.pos): theme_idx = (theme_idx + 1) % len(theme_labels); env.bg_index = theme_idx; play(SND_MENU)
+                    elif back_btn.collidepoint(event.pos): state = 0; play(SND_MENU)
+
+        # --- STATE 1: GAMEPLAY ---
+        elif state == 1:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                    if replay_inputs is None: save_replay(run_log, last_run_replay_file)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3: overlay.toggle()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and overlay.enabled: overlay.dump_csv()
+            if prof: prof.lap("events")
+
+            keys = pygame.key.get_pressed()
+            inputs = Inputs(left=keys[pygame.K_LEFT] or keys[pygame.K_a], right=keys[pygame.K_RIGHT] or keys[pygame.K_d],
+                            jump=keys[pygame.K_UP] or keys[pygame.K_w] or keys[pygame.K_SPACE])
+            sim.prof = prof
+            for _ in range(stepper.advance(time.perf_counter() * 1000)):
+                if replay_inputs is not None: inputs = next(replay_inputs, Inputs())
+                else: run_log.record(inputs)
+                for sim_event in sim.step(inputs): play(SIM_SOUNDS[sim_event])
+                env.advance(sim.scroll_vel)
+                if prof: prof.lap("env.advance")
+                if sim.game_over: break
+            if replay_inputs is None and sim.player.height_ft > high_score: high_score = sim.player.height_ft
+
+            draw_game(screen, sim, env, stepper.alpha, prof)
+            if overlay.enabled:
+                overlay.draw(screen, sim, env)
+                if prof: prof.lap("overlay")
+            if sim.game_over:
+                state = 2
+                if replay_inputs is None:
+                    save_progress()
+                    history.record(sim, theme_labels[theme_idx])
+                    run_log.finish(sim)
+                    save_replay(run_log, last_run_replay_file)
+                    if sim.player.height_ft and sim.player.height_ft >= high_score: save_replay(run_log, high_score_replay_file)
+            pygame.display.flip(); frame_rate = RENDER_FPS
+            if prof: prof.lap("display.flip")
+
+        # --- STATE 2: GAME OVER ---
+        elif state == 2:
+            if not deposited_this_gameover:
+                last_run_cents = sim.player.run_cents
+                if replay_inputs is None:
+                    bank_cents += last_run_cents
+                    save_progress()
+                deposited_this_gameover = True
+
+            # Nothing moves on this screen: draw it once over the last gameplay frame, then sleep until input
+            if idle.key != (2, last_run_cents, bank_cents):
+                draw_gameover_ui(screen); pygame.display.flip()
+                idle.key = (2, last_run_cents, bank_cents)
+            frame_rate = 0
+            for event in idle_events(block=True):
+                if event.type == pygame.QUIT: running = False
+                if event.type == pygame.MOUSEBUTTONDOWN and retry_btn.collidepoint(event.pos):
+                    play(SND_MENU); state = 0
+                    replay_inputs, stepper = None, FixedStep()
+
+        # --- STATE 4: THE TAILOR ---
+        elif state == 4:
+            frame_rate = idle.present(screen, env, (4, bank_cents, eq_suit_idx, eq_tie_idx, len(owned_suits), len(owned_ties)), draw_tailor_ui)
+
+            for event in idle_events():
+                if event.type == pygame.QUIT: running = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    for r, index in suit_rects:
+                        if r.collidepoint(event.pos):
+                            target = SUITS[index]
+                            if target[0] in owned_suits: eq_suit_idx = index
+                            elif bank_cents >= target[2]: bank_cents -= target[2]; owned_suits.append(target[0]); eq_suit_idx = index
+                            save_progress(); play(SND_MENU)
+                    for r, index in tie_rects:
+                        if r.collidepoint(event.pos):
+                            target = TIES[index]
+                            if target[0] in owned_ties: eq_tie_idx = index
+                            elif bank_cents >= target[2]: bank_cents -= target[2]; owned_ties.append(target[0]); eq_tie_idx = index
+                            save_progress(); play(SND_MENU)
+                    if tailor_back_btn.collidepoint(event.pos): state = 0; play(SND_MENU)
+
+        # --- STATE 5: LEADERBOARD ---
+        elif state == 5:
+            frame_rate = idle.present(screen, env, (5, board_idx), draw_leaderboard_ui)
+            for event in idle_events():
+                if event.type == pygame.QUIT: running = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if board_mode_btn.collidepoint(event.pos): board_idx = (board_idx + 1) % len(board_filters); play(SND_MENU)
+                    elif tailor_back_btn.collidepoint(event.pos): state = 0; play(SND_MENU)
+
+        clock.tick(frame_rate)
+        if prof:
+            prof.lap("clock.tick")
+            prof.end_frame()
+
+    pygame.quit()
+    store.close()
+    history.close()
\ No newline at end of file
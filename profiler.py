@@ -0,0 +1,73 @@
+import csv
+import math
+import time
+from collections import deque
+
+# --- FRAME PROFILER ---
+# Lap timer shared by the benchmarks and the sim/renderer: begin_frame() starts the clock, and each
+# lap(name) charges the time since the previous lap to `name`. Code paths take `prof=None` and guard
+# with `if prof:`, so an unprofiled frame pays for a None check per section and nothing else.
+clock = time.perf_counter
+
+class FrameProfiler:
+    def __init__(self, window=600):
+        self.frames = deque(maxlen=window)  # one {section: seconds} dict per frame, "frame" is the total
+        self.current = {}
+        self.start = self.t = 0.0
+        self.names, self.known = [], set()  # Every section seen so far, in lap order (see sections())
+
+    def begin_frame(self):
+        self.current = {}
+        self.start = self.t = clock()
+
+    def lap(self, name):
+        now = clock()
+        self.current[name] = self.current.get(name, 0.0) + now - self.t
+        self.t = now
+
+    def end_frame(self):
+        self.current["frame"] = clock() - self.start
+        self.frames.append(self.current)
+        if not self.known.issuperset(self.current): self.add_sections(self.current)
+        return self.current
+
+    def add_sections(self, frame):
+        # A section first seen in a later frame lands next to its neighbours from that frame
+        at = 0
+        for name in frame:
+            if name in self.known: at = self.names.index(name) + 1
+            else: self.names.insert(at, name); self.known.add(name); at += 1
+
+    def sections(self):
+        # In lap order, kept up to date by end_frame() so the overlay can ask every refresh for free
+        return self.names
+
+    def samples(self, name):
+        # Frames that never reached a section count as 0 ms for it
+        return [frame.get(name, 0.0) for frame in self.frames]
+
+    def summary(self, percentiles=(50, 95, 99)):
+        # {section: {"p50": ms, ..., "mean": ms, "max": ms}}
+        out = {}
+        for name in self.sections():
+            values = sorted(self.samples(name))
+            stats = {f"p{p}": round(percentile(values, p) * 1000, 4) for p in percentiles}
+            stats["mean"] = round(sum(values) / len(values) * 1000, 4)
+            stats["max"] = round(values[-1] * 1000, 4)
+            out[name] = stats
+        return out
+
+    def write_csv(self, path):
+        # One row per captured frame, one column per section, in ms
+        names = self.sections()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_index"] + names)
+            for i, frame in enumerate(self.frames):
+                writer.writerow([i] + [f"{frame.get(name, 0.0) * 1000:.4f}" for name in names])
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values: return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
@@ -0,0 +1,83 @@
+import sys
+import time
+import struct
+from sim import GameSim, Inputs, DIFFICULTIES
+
+# --- INPUT RECORDING & REPLAY ---
+# A run is fully determined by (seed, difficulty, per-tick inputs). Inputs pack into 3 bits per tick
+# (left, right, jump) and are run-length encoded one byte per run: high 3 bits input, low 5 bits run length - 1.
+# The header also stores the recorded outcome so a replay can check it reproduced the run bit-for-bit.
+MAGIC = b"WSCR"
+VERSION = 2  # 2: platforms and items come from the seeded level stream
+HEADER = struct.Struct("<4sBIBIIi")  # magic, version, seed, difficulty, ticks, height_ft, run_cents
+MAX_RUN = 32
+
+def pack_inputs(inputs):
+    return int(bool(inputs.left)) | int(bool(inputs.right)) << 1 | int(bool(inputs.jump)) << 2
+
+def unpack_inputs(bits):
+    return Inputs(bool(bits & 1), bool(bits & 2), bool(bits & 4))
+
+class InputLog:
+    def __init__(self, seed, difficulty):
+        self.seed, self.difficulty = seed, difficulty
+        self.runs = []  # [bits, count]
+        self.ticks = 0
+        self.height_ft, self.run_cents = 0, -1  # -1: outcome not recorded yet
+
+    def record(self, inputs):
+        bits = pack_inputs(inputs)
+        if self.runs and self.runs[-1][0] == bits and self.runs[-1][1] < MAX_RUN: self.runs[-1][1] += 1
+        else: self.runs.append([bits, 1])
+        self.ticks += 1
+
+    def finish(self, sim):
+        self.height_ft, self.run_cents = sim.player.height_ft, sim.player.run_cents
+
+    def __iter__(self):
+        for bits, count in self.runs:
+            inputs = unpack_inputs(bits)
+            for _ in range(count): yield inputs
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.seed, DIFFICULTIES.index(self.difficulty), self.ticks, self.height_ft, self.run_cents)
+        return header + bytes(bits << 5 | (count - 1) for bits, count in self.runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, diff, ticks, height_ft, run_cents = HEADER.unpack_from(data)
+        if magic != MAGIC: raise ValueError("not a Wall Street Climber replay")
+        if version != VERSION: raise ValueError(f"replay is from format version {version}; this build plays version {VERSION}")
+        log = cls(seed, DIFFICULTIES[diff])
+        log.runs = [[b >> 5, (b & 31) + 1] for b in data[HEADER.size:]]
+        log.ticks, log.height_ft, log.run_cents = ticks, height_ft, run_cents
+        return log
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f: return cls.from_bytes(f.read())
+
+def simulate(log):
+    # Re-run a recorded game headlessly, as fast as the sim goes
+    sim = GameSim(log.difficulty, log.seed)
+    for inputs in log:
+        sim.step(inputs)
+        if sim.game_over: break
+    return sim
+
+def matches(log, sim):
+    return log.run_cents < 0 or (sim.player.height_ft, sim.player.run_cents) == (log.height_ft, log.run_cents)
+
+if __name__ == "__main__":
+    # python replay.py RUN.replay [...]  -> headless re-simulation; `python main.py --replay RUN.replay` to watch one
+    ok = True
+    for path in sys.argv[1:]:
+        log = InputLog.load(path)
+        start = time.perf_counter()
+        sim = simulate(log)
+        secs = time.perf_counter() - start
+        ok &= matches(log, sim)
+        print(f"{path}: {log.difficulty} seed={log.seed} ticks={sim.frame}/{log.ticks} height={sim.player.height_ft}ft "
+              f"earned={sim.player.run_cents}c death={sim.death_cause} "
+              f"{'MATCH' if matches(log, sim) else 'MISMATCH'} ({sim.frame / max(secs, 1e-9):.0f} ticks/s)")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,138 @@
+import os
+import json
+import threading
+
+# --- SAVE STORE ---
+# All progress lives in one JSON file behind an in-memory model. The game thread only ever touches memory:
+# update() swaps in new values and wakes a writer thread, which coalesces bursts of changes into one commit.
+# Commits write a temp file, fsync it and os.replace() it over the save, so a crash mid-write leaves the
+# previous save intact; the bank and the wardrobe it paid for always land on disk together.
+VERSION = 1
+DEFAULTS = {"high_score": 0, "bank_cents": 0, "owned_suits": ["Navy"], "owned_ties": ["Red"], "eq_suit_idx": 0, "eq_tie_idx": 0}
+COALESCE_SECS = 0.25  # Changes arriving this close together (a spree at the Tailor) share one write
+
+def read_legacy(folder):
+    # Progress from the pre-store highscore.txt / bank.txt / wardrobe.txt, whichever of them exist
+    data = {}
+    def read(name):
+        path = os.path.join(folder, name)
+        if not os.path.exists(path): return None
+        with open(path, "r") as f: return f.read()
+    try:
+        text = read("highscore.txt")
+        if text is not None: data["high_score"] = int(text)
+    except (OSError, ValueError): pass
+    try:
+        text = read("bank.txt")
+        if text is not None: data["bank_cents"] = int(text)
+    except (OSError, ValueError): pass
+    try:
+        text = read("wardrobe.txt")
+        if text is not None:
+            lines = text.splitlines()
+            data.update(owned_suits=lines[0].split(","), owned_ties=lines[1].split(","),
+                        eq_suit_idx=int(lines[2]), eq_tie_idx=int(lines[3]))
+    except (OSError, ValueError, IndexError): pass
+    return data
+
+def atomic_write(path, data):
+    # Readers see either the old file or the complete new one, never a torn mix
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        # Make the rename itself durable; not possible (or needed) on every platform
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try: os.fsync(fd)
+        finally: os.close(fd)
+    except OSError: pass
+
+class SaveStore:
+    def __init__(self, path, legacy_dir=None):
+        self.path = path
+        self.data = dict(DEFAULTS)
+        self.files = {}  # path -> bytes queued by write_file(), written by the same thread
+        self.error = None  # Last failed save commit
+        self.cond = threading.Condition()
+        self.changes = self.committed = 0  # Bumped by every update() / set to it by every commit that reached disk
+        self.closed = False
+
+        saved = self.read()
+        if saved is not None: self.data.update(saved)
+        elif legacy_dir is not None:
+            legacy = read_legacy(legacy_dir)
+            if legacy:
+                self.data.update(legacy)
+                self.changes = 1  # Write the migrated save straight away; the old files are left as they were
+
+        self.thread = threading.Thread(target=self.run, name="save-writer", daemon=True)
+        self.thread.start()
+
+    def read(self):
+        try:
+            with open(self.path, "r") as f: saved = json.load(f)
+        except FileNotFoundError: return None
+        except (OSError, ValueError) as exc:
+            # Only a foreign or hand-edited file gets here, since commits are atomic; keep it for inspection
+            print(f"Save file {self.path} is unreadable ({exc}); starting from defaults")
+            try: os.replace(self.path, self.path + ".bad")
+            except OSError: pass
+            return None
+        if not isinstance(saved, dict): return None
+        if saved.get("version", 0) > VERSION:
+            print(f"Save file is from format version {saved['version']}; this build writes version {VERSION}")
+        return {key: saved[key] for key in DEFAULTS if key in saved}
+
+    def __getitem__(self, key): return self.data[key]
+
+    def update(self, **fields):
+        # Lists are copied so later in-place edits by the caller can't race the writer
+        fields = {key: list(value) if isinstance(value, list) else value for key, value in fields.items()}
+        with self.cond:
+            self.data = {**self.data, **fields}
+            self.changes += 1
+            self.cond.notify()
+
+    def write_file(self, path, data):
+        # Queue a whole-file write (replays) behind the save; a newer write to the same path replaces it
+        with self.cond:
+            self.files[path] = data
+            self.cond.notify()
+
+    def pending(self):
+        return self.changes != self.committed or self.files
+
+    def run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.pending() or self.closed)
+                if not self.pending(): return
+                self.cond.wait_for(lambda: self.closed, COALESCE_SECS)  # Later updates ride along
+                changes, data, files = self.changes, self.data, self.files
+                self.files = {}
+            for path, blob in files.items():
+                try: atomic_write(path, blob)
+                except OSError as exc: print(f"Could not write {path}: {exc}")
+            if changes == self.committed: continue
+            try:
+                atomic_write(self.path, json.dumps({"version": VERSION, **data}, indent=1).encode())
+                self.error = None
+            except OSError as exc:
+                # Memory still holds everything; the next update (or close) tries again
+                if self.error is None: print(f"Could not write save file: {exc}")
+                self.error = exc
+                with self.cond:
+                    if self.closed: return
+                    self.cond.wait_for(lambda: self.changes != changes or self.files or self.closed)
+                continue
+            with self.cond: self.committed = changes
+
+    def close(self, timeout=5.0):
+        # Called once at exit: the writer commits anything pending right away and stops
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join(timeout)
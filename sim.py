@@ -0,0 +1,517 @@
+import pygame
+import random
+import numpy as np
+from collections import namedtuple, deque
+
+# --- HEADLESS SIMULATION ---
+# All gameplay rules live here. Nothing in this module needs a display, fonts or the mixer
+# (pygame.Rect works without pygame.init), so GameSim can be stepped thousands of times a second.
+# main.py renders a GameSim and turns its events into sounds.
+WIDTH, HEIGHT = 400, 600
+# The sim ticks at a fixed 60 Hz: every speed and gravity constant below is an amount per tick, and the
+# spawn timers advance TICK_MS per tick, so this is not a tuning knob. Changing it changes game speed.
+TICK_HZ = 60
+TICK_MS = 1000 / TICK_HZ
+
+DIFFICULTIES = ["Easy", "Medium", "Difficult"]
+
+Inputs = namedtuple("Inputs", "left right jump", defaults=(False, False, False))
+NO_INPUT = Inputs()
+
+def get_drop_width(difficulty: str, height_ft: int) -> int:
+    if difficulty == "Easy": base, growth, cap = 75, 0.85, 170
+    elif difficulty == "Medium": base, growth, cap = 120, .5, 180
+    else: base, growth, cap = 150, 1.6, 320
+    return max(70, min(cap, int(base + height_ft * growth * 0.06)))
+
+class FixedStep:
+    # Accumulator clock: converts wall time into a whole number of fixed sim ticks.
+    # alpha is how far the renderer is between the last two ticks, for interpolation.
+    # speed is playback speed (replays' --speed): 2.0 runs two TICK_MS ticks per 16.7 ms of wall time.
+    def __init__(self, speed=1.0, max_ticks=8):
+        self.tick_ms = TICK_MS / speed
+        self.max_ticks = max_ticks
+        self.reset()
+
+    def reset(self):
+        self.accum, self.last = 0.0, None
+
+    def advance(self, now_ms):
+        # The first call runs one tick so the opening frame matches the old loop
+        if self.last is None: self.last = now_ms - self.tick_ms
+        self.accum += now_ms - self.last
+        self.last = now_ms
+        ticks = int(self.accum // self.tick_ms)
+        self.accum -= ticks * self.tick_ms
+        # After a long stall, drop the backlog instead of fast-forwarding the run
+        if ticks > self.max_ticks: ticks, self.accum = self.max_ticks, 0.0
+        return ticks
+
+    @property
+    def alpha(self): return self.accum / self.tick_ms
+
+# --- ENTITIES ---
+# Every entity keeps prev_x/prev_y, its position before the current tick, so frames can be drawn between
+# ticks. Entities are __slots__ classes whose __init__ just calls reset(), so a Pool can hand a dead one
+# back out by re-running reset() on it; reset() also syncs prev, which keeps reused ones from sliding.
+
+class Pool:
+    # Live entities of one type in a dense list (plus their rects, for Rect.collidelistall), and a free
+    # list of dead ones. remove() swaps the last live entity into the hole: O(1), but order isn't kept,
+    # so loops that remove must walk the list backwards.
+    def __init__(self, cls):
+        self.cls, self.active, self.rects, self.free = cls, [], [], []
+
+    def spawn(self, *args):
+        if self.free:
+            e = self.free.pop()
+            e.reset(*args)
+        else: e = self.cls(*args)
+        e.slot = len(self.active)
+        self.active.append(e); self.rects.append(e.rect)
+        return e
+
+    def remove(self, e):
+        i, active, rects = e.slot, self.active, self.rects
+        last = active.pop(); rects.pop()
+        if last is not e: active[i], rects[i], last.slot = last, last.rect, i
+        self.free.append(e)
+
+    def __len__(self): return len(self.active)
+    def __iter__(self): return iter(self.active)
+    def __getitem__(self, i): return self.active[i]
+
+class Player:
+    __slots__ = ("rect", "prev_x", "prev_y", "vel_y", "height_ft", "pixels_climbed", "on_ground", "current_platform",
+                 "has_shield", "invincible", "invincible_timer", "run_cents", "last_bonus_bucket")
+
+    def __init__(self):
+        self.rect = pygame.Rect(200, 500, 25, 50)
+        self.prev_x, self.prev_y = self.rect.x, self.rect.y
+        self.vel_y = 0
+        self.height_ft = 0
+        self.pixels_climbed = 0
+        self.on_ground = False
+        self.current_platform = None
+        self.has_shield = False
+        self.invincible = False
+        self.invincible_timer = 0
+        self.run_cents = 0
+        self.last_bonus_bucket = 0
+
+    def jump(self):
+        if self.on_ground:
+            self.vel_y = -18
+            self.on_ground = False
+            self.current_platform = None
+            return True
+        return False
+
+    def apply_gravity(self):
+        self.vel_y += 0.8
+        self.rect.y += self.vel_y
+
+    def update_invincibility(self, now_ms):
+        if self.invincible and (now_ms - self.invincible_timer > 3000):
+            self.invincible = False
+
+    def update_height_and_money(self):
+        # Returns True when a 250ft bonus was paid out
+        new_height = int(self.pixels_climbed // 10)
+        if new_height > self.height_ft:
+            delta = new_height - self.height_ft
+            self.height_ft = new_height
+            self.run_cents += delta
+        bucket = self.height_ft // 250
+        if bucket > self.last_bonus_bucket:
+            self.run_cents += (bucket - self.last_bonus_bucket) * 500
+            self.last_bonus_bucket = bucket
+            return True
+        return False
+
+class Platform:
+    __slots__ = ("rect", "prev_x", "prev_y", "slot", "move_type", "direction", "speed", "start_y", "v_range")
+
+    def __init__(self, x, y, move_type, speed):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, move_type, speed)
+
+    def reset(self, x, y, move_type, speed):
+        # move_type 0 is static, 1 slides sideways, 2 bobs up and down
+        self.rect.update(x, y, 100, 18)
+        self.prev_x, self.prev_y = x, y
+        self.move_type, self.direction, self.speed = move_type, 1, speed
+        self.start_y, self.v_range = y, 60
+
+    def update(self, scroll_speed):
+        self.rect.y += scroll_speed
+        self.start_y += scroll_speed
+        if self.move_type == 1:
+            self.rect.x += self.direction * self.speed
+            if self.rect.right >= WIDTH or self.rect.left <= 0: self.direction *= -1
+        elif self.move_type == 2:
+            self.rect.y += self.direction * (self.speed // 2)
+            if abs(self.rect.y - self.start_y) > self.v_range: self.direction *= -1
+
+class HeliEnemy:
+    __slots__ = ("rect", "prev_x", "prev_y", "slot", "direction", "speed")
+
+    def __init__(self, score, difficulty, rng=random):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(score, difficulty, rng)
+
+    def reset(self, score, difficulty, rng=random):
+        self.rect.update(rng.randint(0, WIDTH - 60), -100, 60, 30)
+        self.prev_x, self.prev_y = self.rect.x, self.rect.y
+        self.direction = rng.choice((-1, 1))
+        base_speed = 2 if difficulty == "Easy" else 4 if difficulty == "Medium" else 6
+        self.speed = min(9, base_speed + (score / 200))
+
+    def update(self, scroll_vel):
+        self.rect.x += self.direction * self.speed
+        self.rect.y += scroll_vel
+        if self.rect.right >= WIDTH: self.direction = -1
+        elif self.rect.left <= 0: self.direction = 1
+
+class ShieldItem:
+    __slots__ = ("rect", "prev_x", "prev_y", "slot", "collected")
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.rect.update(x, y, 30, 30)
+        self.prev_x, self.prev_y = x, y
+        self.collected = False
+
+    def update(self, scroll_vel): self.rect.y += scroll_vel
+
+# Warning widths snap to buckets so the renderer only ever bakes a few banner sizes
+WARNING_BUCKET = 10
+
+class PennyWarning:
+    __slots__ = ("x", "w", "y", "h", "slot", "spawn_time", "delay_ms")
+    rect = None  # Not a collider; Pool keeps a None in its rect list
+
+    def __init__(self, x, w, now_ms, delay_ms=900):
+        self.reset(x, w, now_ms, delay_ms)
+
+    def reset(self, x, w, now_ms, delay_ms=900):
+        w = max(WARNING_BUCKET, int(round(w / WARNING_BUCKET)) * WARNING_BUCKET)
+        self.x, self.w, self.y, self.h = int(max(0, min(WIDTH - w, x))), int(w), 70, 26
+        self.spawn_time, self.delay_ms = now_ms, delay_ms
+    def ready_to_drop(self, now_ms): return (now_ms - self.spawn_time) >= self.delay_ms
+
+class PennyField:
+    # Struct-of-arrays pennies: only the first `count` slots are live. Pennies fall straight down and
+    # ignore scrolling, so a tick is one vectorized add; hits and culling are masks over the live slice.
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.x, self.y, self.prev_y, self.speed = (np.zeros(capacity) for _ in range(4))
+        self.r = np.zeros(capacity, dtype=np.int32)
+
+    def __len__(self): return self.count
+
+    def spawn(self, x, y, speed, r=6):
+        n = self.count
+        if n == len(self.x):
+            grow = lambda a: np.concatenate((a, np.zeros_like(a)))
+            self.x, self.y, self.prev_y, self.speed, self.r = map(grow, (self.x, self.y, self.prev_y, self.speed, self.r))
+        self.x[n], self.y[n], self.prev_y[n], self.speed[n], self.r[n] = x, y, y, speed, r
+        self.count = n + 1
+
+    def snapshot(self):
+        self.prev_y[:self.count] = self.y[:self.count]
+
+    def update(self):
+        n = self.count
+        self.y[:n] += self.speed[:n]
+
+    def hits(self, rect):
+        # Mask of live pennies overlapping rect, using the same integer box a 2r x 2r Rect centred on them had
+        n, r = self.count, self.r[:self.count]
+        left, top = self.x[:n].astype(np.int32) - r, self.y[:n].astype(np.int32) - r
+        return (left < rect.right) & (left + 2 * r > rect.left) & (top < rect.bottom) & (top + 2 * r > rect.top)
+
+    def offscreen(self):
+        n = self.count
+        return self.y[:n] - self.r[:n] > HEIGHT
+
+    def keep(self, mask):
+        # Compact the live slice down to the pennies where mask is True, preserving order
+        n = int(mask.sum())
+        if n == self.count: return
+        for a in (self.x, self.y, self.prev_y, self.speed, self.r):
+            a[:n] = a[:self.count][mask]
+        self.count = n
+
+class MoneyBag:
+    __slots__ = ("rect", "prev_x", "prev_y", "slot", "collected", "value")
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        # We'll keep it 35x35 to match your current layout
+        self.rect.update(x, y, 35, 35)
+        self.prev_x, self.prev_y = x, y
+        self.collected = False
+        self.value = 500  # $5.00
+
+    def update(self, scroll_vel):
+        self.rect.y += scroll_vel
+
+# --- LEVEL STREAMING ---
+# The level is laid out in "altitude": pixels above the first platform. level_chunks() is an endless
+# seeded generator of chunks; LevelStream keeps a couple of them queued ahead of the camera and turns
+# specs into pooled entities as they scroll into range. Specs come out in altitude order, so the last
+# platform spawned is always the top one, and spawning is placed relative to it.
+PLATFORM_GAP = {"Easy": 130, "Medium": 145, "Difficult": 155}  # Vertical spacing between platforms
+PLATFORM_SPEED = {"Easy": 1.0, "Medium": 1.2, "Difficult": 1.8}
+MAX_STEP_X = 150  # Max sideways offset between consecutive platforms
+JUMP_RISE = 18 ** 2 / (2 * 0.8)  # Peak height of a jump from Player.jump and apply_gravity, ~202px
+CHUNK_PLATFORMS = 8
+LOOKAHEAD_CHUNKS = 2
+START_Y = 550  # Screen y of altitude 0
+PLATFORM_SPAWN_Y = -420  # Platforms appear once they're this far above the top of the screen
+ITEM_SPAWN_Y = -50
+SHIELD_EVERY_FT, BAG_EVERY_FT = 300, 500
+MOVER_MIN_FT = 50  # Vertical movers only start once the player is this high
+
+PlatformSpec = namedtuple("PlatformSpec", "altitude x move_type speed")
+ItemSpec = namedtuple("ItemSpec", "altitude kind x")
+
+def item_altitude(height_ft):
+    # An item placed here crosses ITEM_SPAWN_Y just as the player reaches height_ft
+    return START_Y - ITEM_SPAWN_Y + height_ft * 10
+
+def level_chunks(difficulty, rng):
+    gap, speed_mult = PLATFORM_GAP[difficulty], PLATFORM_SPEED[difficulty]
+    if gap > JUMP_RISE - 20: raise ValueError(f"{difficulty} platform gap {gap}px is out of jump range")
+    lead = START_Y - PLATFORM_SPAWN_Y  # How far above the player a platform is when it spawns
+    altitude, x = 0, 150
+    next_shield, next_bag = SHIELD_EVERY_FT, BAG_EVERY_FT
+    while True:
+        platforms, items = [], []
+        for _ in range(CHUNK_PLATFORMS):
+            if altitude: x = rng.randint(max(0, x - MAX_STEP_X), min(WIDTH - 100, x + MAX_STEP_X))
+            move_type = rng.choice((0, 1, 2)) if (altitude - lead) // 10 > MOVER_MIN_FT else rng.choice((0, 1))
+            platforms.append(PlatformSpec(altitude, x, move_type, rng.randint(2, 3) * speed_mult))
+            altitude += gap
+        while item_altitude(next_shield) < altitude:
+            items.append(ItemSpec(item_altitude(next_shield), ShieldItem, rng.randint(50, WIDTH - 50))); next_shield += SHIELD_EVERY_FT
+        while item_altitude(next_bag) < altitude:
+            items.append(ItemSpec(item_altitude(next_bag), MoneyBag, rng.randint(50, WIDTH - 50))); next_bag += BAG_EVERY_FT
+        items.sort(key=lambda item: item.altitude)
+        yield platforms, items
+
+class LevelStream:
+    def __init__(self, difficulty, seed):
+        # Its own RNG stream: the layout depends only on (seed, difficulty), never on how the run is played
+        self.chunks = level_chunks(difficulty, random.Random(f"level:{seed}"))
+        self.platforms, self.items = deque(), deque()  # Lookahead ring buffers of specs not spawned yet
+        self.top, self.top_altitude = None, 0
+
+    def refill(self):
+        while len(self.platforms) < CHUNK_PLATFORMS * LOOKAHEAD_CHUNKS:
+            platforms, items = next(self.chunks)
+            self.platforms.extend(platforms); self.items.extend(items)
+
+    def screen_y(self, altitude):
+        # Placed relative to the top platform's resting y, so spacing survives scrolling exactly
+        if self.top is None: return START_Y - altitude
+        return self.top.start_y - (altitude - self.top_altitude)
+
+    def spawn(self, sim):
+        pending = self.platforms
+        if len(pending) < CHUNK_PLATFORMS: self.refill()
+        while self.screen_y(pending[0].altitude) >= PLATFORM_SPAWN_Y:
+            spec = pending.popleft()
+            self.top = sim.platforms.spawn(spec.x, self.screen_y(spec.altitude), spec.move_type, spec.speed)
+            self.top_altitude = spec.altitude
+            if len(pending) < CHUNK_PLATFORMS: self.refill()
+        items = self.items
+        while items and self.screen_y(items[0].altitude) >= ITEM_SPAWN_Y:
+            spec = items.popleft()
+            pool = sim.shields if spec.kind is ShieldItem else sim.money_bags
+            pool.spawn(spec.x, self.screen_y(spec.altitude))
+
+# --- GAME STATE ---
+
+class GameSim:
+    # One run. step() advances exactly one tick and returns the events that happened in it
+    # ("jump", "land", "money", "pennies", "death") so the caller can play sounds.
+    # Every random decision comes from self.rng or the level's own stream seeded from self.seed, so
+    # (seed, difficulty, inputs) reproduces a run exactly.
+    def __init__(self, difficulty, seed=None):
+        self.difficulty = difficulty
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.time_ms = 0.0
+        self.frame = 0
+        self.player = Player()
+        self.platforms, self.helis, self.shields = Pool(Platform), Pool(HeliEnemy), Pool(ShieldItem)
+        self.pennies, self.penny_warnings, self.money_bags = PennyField(), Pool(PennyWarning), Pool(MoneyBag)
+        self.events = []  # step()'s return value, reused every tick
+        self.reach = pygame.Rect(0, 0, 0, 0)  # Player box for the collision broadphase
+        self.last_landed_platform_id = None
+        self.scroll_vel = 0
+        self.game_over, self.death_cause = False, None
+        self.prof = None  # Optional profiler.FrameProfiler; step() laps its sections into it
+        # Spawn clocks (these used to be pygame.time.set_timer events)
+        self.enemy_clock, self.enemy_interval = 0.0, 3000
+        self.penny_clock, self.penny_interval = 0.0, 6000
+
+        self.level = LevelStream(difficulty, self.seed)
+        self.level.spawn(self)
+
+    def die(self, cause, events):
+        if not self.game_over:
+            self.game_over, self.death_cause = True, cause
+            events.append("death")
+
+    def hit(self, cause, events):
+        # Shield soaks one hit and grants 3s of invincibility
+        player = self.player
+        if player.invincible: return
+        if player.has_shield: player.has_shield, player.invincible, player.invincible_timer = False, True, self.time_ms
+        else: self.die(cause, events)
+
+    def snapshot(self):
+        player = self.player
+        player.prev_x, player.prev_y = player.rect.topleft
+        for group in (self.platforms.active, self.helis.active, self.shields.active, self.money_bags.active):
+            for e in group: e.prev_x, e.prev_y = e.rect.topleft
+        self.pennies.snapshot()
+
+    def step(self, inputs=NO_INPUT):
+        # The returned list is reused: it's only valid until the next step()
+        events = self.events
+        events.clear()
+        if self.game_over: return events
+        player, difficulty, rng, prof = self.player, self.difficulty, self.rng, self.prof
+        self.frame += 1
+        self.time_ms += TICK_MS
+        self.scroll_vel = scroll_vel = 0
+        self.snapshot()
+
+        # Timers
+        self.enemy_clock += TICK_MS
+        if self.enemy_clock >= self.enemy_interval:
+            self.enemy_clock -= self.enemy_interval
+            if len(self.helis) < 2: self.helis.spawn(player.height_ft, difficulty, rng)
+        self.penny_clock += TICK_MS
+        if self.penny_clock >= self.penny_interval:
+            self.penny_clock = 0.0
+            if len(self.penny_warnings) < 1:
+                w = get_drop_width(difficulty, player.height_ft)
+                self.penny_warnings.spawn(rng.randint(0, WIDTH - w), w, self.time_ms, 1500)
+                self.penny_interval = max(3000, 6000 - int(player.height_ft * 1.0))
+
+        # Input
+        if inputs.left: player.rect.x -= 8
+        if inputs.right: player.rect.x += 8
+        if inputs.jump and player.jump(): events.append("jump")
+
+        player.apply_gravity(); player.update_invincibility(self.time_ms)
+        if player.on_ground and player.current_platform:
+            if player.current_platform.move_type == 1: player.rect.x += player.current_platform.direction * player.current_platform.speed
+            if player.current_platform.move_type == 2: player.rect.bottom = player.current_platform.rect.top
+        player.rect.left = max(0, player.rect.left); player.rect.right = min(WIDTH, player.rect.right)
+
+        if player.rect.y <= 250 and player.vel_y < 0:
+            self.scroll_vel = scroll_vel = abs(player.vel_y)
+            player.rect.y += scroll_vel; player.pixels_climbed += scroll_vel
+            if player.update_height_and_money(): events.append("money")
+
+        if prof: prof.lap("update.physics")
+
+        # Penny Warnings
+        for warn in reversed(self.penny_warnings.active):
+            if warn.ready_to_drop(self.time_ms):
+                left, right = warn.x + 10, warn.x + warn.w - 10
+                span = max(1, right - left)
+                for i in range(5):
+                    px = max(left, min(right, left + int((i + 0.5) * span / 5) + rng.randint(-6, 6)))
+                    self.pennies.spawn(px, warn.y - rng.randint(40, 140), rng.uniform(8.0, 12.0))
+                events.append("pennies"); self.penny_warnings.remove(warn)
+
+        if prof: prof.lap("update.penny_warnings")
+
+        # Pennies
+        pennies = self.pennies
+        if pennies.count:
+            pennies.update()
+            hits = pennies.hits(player.rect)
+            # A shield or invincibility eats every coin that touched the player; otherwise the first one kills
+            if hits.any(): self.hit("penny", events)
+            if not self.game_over: pennies.keep(~(hits | pennies.offscreen()))
+
+        if prof: prof.lap("update.pennies")
+
+        # Movement. Everything moves before any collision test so the broadphase sees final positions.
+        # Loops that can remove walk backwards, since Pool.remove swaps the last entity into the hole.
+        shields = self.shields.active
+        for s in reversed(shields):
+            s.update(scroll_vel)
+            if s.rect.top > HEIGHT: self.shields.remove(s)
+        if prof: prof.lap("update.shields")
+
+        bags = self.money_bags.active
+        for mb in reversed(bags):
+            mb.update(scroll_vel)
+            if mb.rect.top > HEIGHT: self.money_bags.remove(mb)
+        if prof: prof.lap("update.money_bags")
+
+        platforms = self.platforms.active
+        for plat in reversed(platforms):
+            plat.update(scroll_vel)
+            if plat.rect.top > HEIGHT: self.platforms.remove(plat)
+        # New platforms, shields and money bags come in from the level stream as the camera climbs
+        self.level.spawn(self)
+        if prof: prof.lap("update.platforms")
+
+        helis = self.helis.active
+        for h in reversed(helis):
+            h.update(scroll_vel)
+            if h.rect.top > HEIGHT: self.helis.remove(h)
+        if prof: prof.lap("update.helicopters")
+
+        # Collisions. The broadphase is a C-level Rect.collidelistall over each pool's rect list; groups
+        # resolve in the order they always have (shields, bags, platforms, helicopters). Landing can lift
+        # the player up to 20px, hence the taller box.
+        pr, reach = player.rect, self.reach
+        reach.update(pr.x, pr.y - 20, pr.width, pr.height + 40)
+
+        if shields:
+            for k in reach.collidelistall(self.shields.rects):
+                s = shields[k]
+                if pr.colliderect(s.rect) and not s.collected: player.has_shield, s.collected = True, True
+
+        if bags:
+            # Backwards, so collecting (swap-removing) a bag can't move one we haven't looked at yet
+            for k in reversed(reach.collidelistall(self.money_bags.rects)):
+                mb = bags[k]
+                if pr.colliderect(mb.rect) and not mb.collected:
+                    mb.collected = True
+                    player.run_cents += mb.value
+                    events.append("money")
+                    self.money_bags.remove(mb)
+
+        player.on_ground = False; landed_this_frame = False
+        for k in reach.collidelistall(self.platforms.rects):
+            plat = platforms[k]
+            if player.vel_y >= 0 and pr.colliderect(plat.rect) and pr.bottom <= plat.rect.top + 20:
+                pr.bottom, player.vel_y, player.on_ground, player.current_platform = plat.rect.top, 0, True, plat
+                if id(plat) != self.last_landed_platform_id: landed_this_frame, self.last_landed_platform_id = True, id(plat)
+
+        if helis:
+            for k in reach.collidelistall(self.helis.rects):
+                if pr.colliderect(helis[k].rect): self.hit("helicopter", events)
+        if landed_this_frame: events.append("land")
+
+        if player.rect.top > HEIGHT: self.die("fall", events)
+        if prof: prof.lap("update.collisions")
+        return events